@@ -0,0 +1,51 @@
+"""
+Make the console scripts generated by setuptools import the entry point
+directly instead of going through pkg_resources.
+
+The stock wrapper calls pkg_resources.load_entry_point(), which scans every
+distribution on sys.path before GitTTY even starts. Importing this module
+before setup() patches setuptools so the generated `gittty` script is just
+`from gittty import main; sys.exit(main())`.
+"""
+
+import re
+
+try:
+    from setuptools.command import easy_install
+except ImportError:  # Newer setuptools without easy_install; nothing to patch
+    easy_install = None
+
+TEMPLATE = r"""
+# -*- coding: utf-8 -*-
+import re
+import sys
+
+from {0} import {1}
+
+if __name__ == '__main__':
+    sys.argv[0] = re.sub(r'(-script\.pyw?|\.exe)?$', '', sys.argv[0])
+    sys.exit({2}())
+""".lstrip()
+
+
+@classmethod
+def get_args(cls, dist, header=None):
+    """Yield write_script() argument tuples for console and gui scripts."""
+    if header is None:
+        header = cls.get_header()
+    for type_ in "console", "gui":
+        group = type_ + "_scripts"
+        for name, ep in dist.get_entry_map(group).items():
+            # Refuse names that could escape the scripts directory
+            if re.search(r"[\\/]", name):
+                raise ValueError("Path separators not allowed in script names")
+            script_text = TEMPLATE.format(
+                ep.module_name, ep.attrs[0], ".".join(ep.attrs)
+            )
+            args = cls._get_script_args(type_, name, header, script_text)
+            for res in args:
+                yield res
+
+
+if easy_install is not None:
+    easy_install.ScriptWriter.get_args = get_args
@@ -1,11 +1,16 @@
 from setuptools import setup, find_packages
+import fastentrypoints  # noqa: F401  (fast console_scripts wrapper)
+import re
 
 with open('requirements.txt') as f:
     requirements = f.read().splitlines()
 
+with open('src/gittty.py') as f:
+    version = re.search(r'^__version__ = "([^"]+)"', f.read(), re.M).group(1)
+
 setup(
     name='gittty',
-    version='0.9.1',
+    version=version,
     py_modules=['gittty'],
     packages=find_packages(where='src'),
     package_dir={'': 'src'},
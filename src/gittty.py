@@ -6,59 +6,359 @@ import argparse
 from modules.user_interface import (
     display_welcome,
     get_user_input,
-    get_repo_url_interactively,
-    get_destination_path_interactively,
-    confirm_destination,
-    get_branch_or_tag_interactively,
-    ask_for_shallow_clone,
-    manage_settings,
-    browse_frequent_repos,
-    get_repo_action_interactively,
-    display_repo_details,
-    browse_online_repositories,
+    is_yes,
+    parse_menu_index,
 )
-from modules.git_operations import (
-    clone_repository,
-    execute_script_in_repo,
-    check_git_installed,
-    check_connectivity,
-    pull_repository,
-    get_repo_root,
-)
-from modules.config_manager import (
-    load_frequent_repos,
-    add_frequent_repo,
-    remove_frequent_repo,
+
+# Single source of truth for the version; setup.py reads it from here.
+__version__ = "0.9.1"
+
+_DESCRIPTION = "GitTTY: Your Git lifeline in a TTY environment."
+_EPILOG = (
+    "By default, GitTTY runs in an interactive mode with a menu-driven interface. "
+    "Shallow clones only contain the latest commit; pass --depth=1 to later "
+    "'git fetch' calls in them to keep them shallow."
 )
+# The remaining modules.* symbols are imported inside the menu branches that
+# use them, so starting GitTTY (or quitting right away) doesn't pay for them.
+
+# Set by --shallow/--full-history; None means ask before each clone
+_shallow_override = None
+# Set by --blobless/--treeless; None means use the "clone_filter" setting
+_clone_filter_override = None
+# Cleared by --no-checkout
+_checkout = True
+# Set by --single-branch
+_single_branch = False
+# Set by --recurse-submodules
+_recurse_submodules = False
+# Set by --jobs; None lets clone_many() pick
+_clone_jobs = None
+
+_MANAGE_REPOS_HEADER = "\n--- Manage Frequent Repositories ---"
+_MANAGE_REPOS_FOOTER = "------------------------------------"
 
 
 def manage_frequent_repos():
     """Handles the logic for managing frequent repositories."""
+    from modules.config_manager import load_frequent_repos, remove_frequent_repo
+
     while True:
-        print("\n--- Manage Frequent Repositories ---")
         repos = load_frequent_repos()
         if not repos:
+            print(_MANAGE_REPOS_HEADER)
             print("No frequent repositories found.")
             return
 
-        for i, repo in enumerate(repos):
-            print(f"  {i + 1}: {repo['name']} ({repo['url']})")
-        print("------------------------------------")
+        listing = "\n".join(
+            f"  {i + 1}: {repo['name']} ({repo['url']})" for i, repo in enumerate(repos)
+        )
+        print(f"{_MANAGE_REPOS_HEADER}\n{listing}\n{_MANAGE_REPOS_FOOTER}")
 
         choice = get_user_input(
-            "Select a repo to remove (by number), or press Enter to go back"
+            "Select a repo to remove (by number), 'c' to clone all missing ones, "
+            "'p' to pull all cloned ones, or press Enter to go back"
         )
         if not choice:
             break
 
-        if choice.isdigit():
-            repo_index = int(choice) - 1
+        if choice in ("c", "C"):
+            _clone_missing_repos(repos)
+            continue
+        if choice in ("p", "P"):
+            _pull_cloned_repos(repos)
+            continue
+
+        repo_index = parse_menu_index(choice, len(repos))
+        if repo_index is not None and remove_frequent_repo(repo_index):
+            print("Repository removed successfully.")
+        else:
+            print("Invalid number.")
+
+
+def _clone_missing_repos(repos):
+    """Clones, in parallel, every saved repository whose path doesn't exist yet."""
+    from modules.git_operations import check_connectivity, clone_many
+
+    missing = [repo for repo in repos if repo.get("path") and not os.path.exists(repo["path"])]
+    if not missing:
+        print("All saved repositories are already present on disk.")
+        return
+    if check_connectivity():
+        clone_many(
+            missing,
+            max_workers=_clone_jobs,
+            shallow=_shallow_override,
+            clone_filter=_clone_filter_override,
+            checkout=_checkout,
+            recurse_submodules=_recurse_submodules,
+            single_branch=_single_branch,
+        )
+
+
+def _pull_cloned_repos(repos):
+    """Pulls, in parallel, every saved repository that has been cloned."""
+    from modules.git_operations import check_connectivity, is_git_repo, pull_many
+
+    cloned = [repo["path"] for repo in repos if repo.get("path") and is_git_repo(repo["path"])]
+    if not cloned:
+        print("None of the saved repositories have been cloned yet.")
+        return
+    if not check_connectivity():
+        return
+
+    print(f"\nPulling {len(cloned)} repositories...")
+    results = pull_many(cloned, max_workers=_clone_jobs, recurse_submodules=_recurse_submodules)
+    for path, success, error in results:
+        if success:
+            print(f"✅ {path}")
+        else:
+            print(f"❌ {path}: {error}")
+    updated = sum(success for _, success, _ in results)
+    print(f"\n{updated} of {len(results)} repositories updated.")
+
+
+def _clone_new_repo():
+    """Menu option 1: build or type a repository URL."""
+    from modules.user_interface import get_repo_url_interactively
+
+    return get_repo_url_interactively()
+
+
+def _select_frequent_repo():
+    """Menu option 2: pick a saved repository and choose what to do with it."""
+    from modules.user_interface import (
+        browse_frequent_repos,
+        get_repo_action_interactively,
+        display_repo_details,
+    )
+    from modules.config_manager import remove_frequent_repo
+
+    # Selecting from the saved list is purely local; connectivity is checked
+    # once the clone/pull is about to run.
+    # Use the new browse function with search capability
+    selection = browse_frequent_repos()
+    if not selection:
+        return None  # No repo selected, go back to main menu
+    selected_repo, repo_index = selection
+
+    # Show action menu for the selected repository
+    while True:
+        action = get_repo_action_interactively()
+
+        if action == "clone_update":
+            return selected_repo["url"]  # Continue to main cloning logic
+        elif action == "details":
+            display_repo_details(selected_repo)
+        elif action == "remove":
             if remove_frequent_repo(repo_index):
                 print("Repository removed successfully.")
-            else:
-                print("Invalid number.")
+                return None  # Exit to main menu
+            print("Error removing repository.")
+            input("Press Enter to continue...")
+        elif action == "back" or action is None:
+            return None  # Exit to main menu
+
+
+def _browse_online():
+    """Menu option 3: pick a repository from GitHub/GitLab."""
+    from modules.git_operations import check_connectivity
+    from modules.user_interface import browse_online_repositories
+
+    if not check_connectivity():
+        return None
+    return browse_online_repositories()
+
+
+def _update_frequent_repo():
+    """Menu option 5: pull one of the saved repositories that exists locally."""
+    from modules.git_operations import (
+        check_connectivity,
+        pull_repository,
+        cached_path_exists,
+    )
+    from modules.config_manager import load_frequent_repos
+
+    updatable_repos = []
+    for repo in load_frequent_repos():
+        path = repo.get("path")
+        if path and cached_path_exists(path):
+            updatable_repos.append(repo)
+
+    if not updatable_repos:
+        print(
+            "No updatable repositories found. Clone a repository and save it first."
+        )
+        return None
+
+    print("\n--- Select a Repository to Update ---")
+    for i, repo in enumerate(updatable_repos):
+        print(f"  {i + 1}: {repo['name']} ({repo['path']})")
+    print("-------------------------------------")
+
+    repo_choice = get_user_input(
+        "Select a repo by number, or press Enter to go back"
+    )
+    repo_index = parse_menu_index(repo_choice, len(updatable_repos))
+    if repo_index is not None:
+        selected_repo = updatable_repos[repo_index]
+        if check_connectivity():
+            pull_repository(selected_repo["path"], _recurse_submodules)
+    elif repo_choice:
+        print("Invalid selection.")
+    return None
+
+
+def _open_settings():
+    """Menu option 6."""
+    from modules.user_interface import manage_settings
+
+    manage_settings()
+    return None
+
+
+def _update_gittty():
+    """Menu option 7: pull the GitTTY checkout this script runs from."""
+    from modules.git_operations import (
+        check_connectivity,
+        pull_repository,
+        get_repo_root,
+    )
+
+    if not check_connectivity():
+        return None
+    gittty_repo_path = get_repo_root()
+    if gittty_repo_path:
+        print(f"Found GitTTY repository at: {gittty_repo_path}")
+        pull_repository(gittty_repo_path)
+        print(
+            "\nUpdate complete. If there were any changes, please restart the application."
+        )
+    else:
+        print(
+            "Could not find the GitTTY repository. This command only works if you installed via 'git clone'."
+        )
+    return None
+
+
+# Main menu entries: (key, label, handler). A handler returns the URL of a
+# repository to clone/update, or None to go back to the menu.
+MENU = [
+    ("1", "Clone a new repository", _clone_new_repo),
+    ("2", "Select from frequent repositories", _select_frequent_repo),
+    ("3", "Browse online repositories (GitHub/GitLab)", _browse_online),
+    ("4", "Manage frequent repositories", manage_frequent_repos),
+    ("5", "Update an existing repository", _update_frequent_repo),
+    ("6", "Settings", _open_settings),
+    ("7", "Update GitTTY", _update_gittty),
+]
+_MENU_HANDLERS = {key: handler for key, _, handler in MENU}
+
+# Static menu text, printed with a single write per redraw
+_MAIN_MENU = (
+    "\n--- Main Menu ---\n"
+    + "".join(f"{key}. {label}\n" for key, label, _ in MENU)
+    + "q. Quit\n"
+    + "-------------------"
+)
+
+
+def _clone_or_update(repo_url):
+    """
+    Clones repo_url (or pulls it if the destination is already a checkout).
+    Returns False if the user doesn't want to perform another operation.
+    """
+    from modules.user_interface import (
+        get_destination_path_interactively,
+        confirm_destination,
+        get_branch_or_tag_interactively,
+        ask_for_shallow_clone,
+    )
+    from modules.git_operations import (
+        check_connectivity,
+        clone_repository,
+        execute_script_in_repo,
+        pull_repository,
+        get_repo_name_from_url,
+    )
+    from modules.config_manager import add_frequent_repo
+
+    destination_path = get_destination_path_interactively()
+    if not destination_path:
+        print("The destination path cannot be empty. Please try again.")
+        return True
+
+    # Check what action to take based on destination
+    action = confirm_destination(destination_path)
+    if not action:
+        return True  # User cancelled
+
+    if not check_connectivity():
+        return True
+
+    if action == "pull":
+        # Pull the existing repository
+        if pull_repository(destination_path, _recurse_submodules):
+            print("Repository updated successfully!")
         else:
-            print("Invalid input.")
+            print("Failed to update repository.")
+
+        another_op = get_user_input(
+            "Do you want to perform another operation? (y/n)"
+        )
+        return is_yes(another_op)
+
+    # If action == "clone", proceed with normal cloning
+    branch_or_tag = get_branch_or_tag_interactively()
+    if _shallow_override is None:
+        shallow = ask_for_shallow_clone()
+    else:
+        shallow = _shallow_override
+
+    if clone_repository(
+        repo_url, destination_path, branch_or_tag, shallow,
+        clone_filter=_clone_filter_override,
+        checkout=_checkout,
+        single_branch=_single_branch,
+        recurse_submodules=_recurse_submodules,
+    ):
+        print("Operation completed.")
+
+        repo_name_from_url = get_repo_name_from_url(repo_url)
+        # The repo name comes from the tail of the URL, so it is never absolute
+        # and a plain concatenation is all os.path.join would do here
+        cloned_repo_path = destination_path.rstrip(os.sep) + os.sep + repo_name_from_url
+
+        run_script_choice = get_user_input(
+            "Do you want to execute a script in the cloned repository? (y/n)"
+        )
+        if is_yes(run_script_choice):
+            script_path = get_user_input(
+                "Enter the relative path to the script (e.g., install.sh or scripts/setup.py)"
+            )
+            if script_path:
+                execute_script_in_repo(script_path, cloned_repo_path)
+
+        save_choice = get_user_input(
+            "Do you want to add this repository to the frequent list? (y/n)"
+        )
+        if is_yes(save_choice):
+            repo_name = get_user_input(
+                "Enter a friendly name for this repository"
+            )
+            if not repo_name:
+                repo_name = repo_url
+            add_frequent_repo(
+                {"name": repo_name, "url": repo_url, "path": cloned_repo_path}
+            )
+            print("Repository saved to frequent list.")
+    else:
+        print("Cloning failed. Please check the URL and destination path.")
+
+    another_op = get_user_input(
+        "Do you want to perform another operation? (y/n)"
+    )
+    return is_yes(another_op)
 
 
 def run_interactive_mode():
@@ -67,198 +367,22 @@ def run_interactive_mode():
 
     try:
         while True:
-            print("\n--- Main Menu ---")
-            print("1. Clone a new repository")
-            print("2. Select from frequent repositories")
-            print("3. Browse online repositories (GitHub/GitLab)")
-            print("4. Manage frequent repositories")
-            print("5. Update an existing repository")
-            print("6. Settings")
-            print("7. Update GitTTY")
-            print("q. Quit")
-            print("-------------------")
+            print(_MAIN_MENU)
 
             choice = get_user_input("Select an option")
-            repo_url = None
-
-            if choice == "1":
-                if not check_connectivity():
-                    continue
-                repo_url = get_repo_url_interactively()
-            elif choice == "2":
-                if not check_connectivity():
-                    continue
-                    
-                # Use the new browse function with search capability
-                selected_repo = browse_frequent_repos()
-                if selected_repo:
-                    # Show action menu for the selected repository
-                    while True:
-                        action = get_repo_action_interactively()
-                        
-                        if action == "clone_update":
-                            repo_url = selected_repo["url"]
-                            break  # Exit to main cloning logic
-                        elif action == "details":
-                            display_repo_details(selected_repo)
-                        elif action == "remove":
-                            # Find the repo index in the full list
-                            all_repos = load_frequent_repos()
-                            try:
-                                repo_index = all_repos.index(selected_repo)
-                                if remove_frequent_repo(repo_index):
-                                    print("Repository removed successfully.")
-                                    break  # Exit to main menu
-                                else:
-                                    print("Error removing repository.")
-                            except ValueError:
-                                print("Repository not found in list.")
-                            input("Press Enter to continue...")
-                        elif action == "back" or action is None:
-                            break  # Exit to main menu
-                    
-                    if action != "clone_update":
-                        continue  # Go back to main menu
-                else:
-                    continue  # No repo selected, go back to main menu
-            elif choice == "3":
-                if not check_connectivity():
-                    continue
-                
-                # Browse online repositories
-                online_repo_url = browse_online_repositories()
-                if online_repo_url:
-                    repo_url = online_repo_url
-                else:
-                    continue
-            elif choice == "4":
-                manage_frequent_repos()
-                continue
-            elif choice == "5":
-                if not check_connectivity():
-                    continue
-
-                frequent_repos = load_frequent_repos()
-                updatable_repos = [
-                    repo
-                    for repo in frequent_repos
-                    if repo.get("path") and os.path.exists(repo.get("path"))
-                ]
-
-                if not updatable_repos:
-                    print(
-                        "No updatable repositories found. Clone a repository and save it first."
-                    )
-                    continue
-
-                print("\n--- Select a Repository to Update ---")
-                for i, repo in enumerate(updatable_repos):
-                    print(f"  {i + 1}: {repo['name']} ({repo['path']})")
-                print("-------------------------------------")
-
-                repo_choice = get_user_input(
-                    "Select a repo by number, or press Enter to go back"
-                )
-                if repo_choice.isdigit() and 1 <= int(repo_choice) <= len(
-                    updatable_repos
-                ):
-                    selected_repo = updatable_repos[int(repo_choice) - 1]
-                    pull_repository(selected_repo["path"])
-                elif repo_choice:
-                    print("Invalid selection.")
-
-                continue
-            elif choice == "6":
-                manage_settings()
-                continue
-            elif choice == "7":
-                if not check_connectivity():
-                    continue
-                gittty_repo_path = get_repo_root()
-                if gittty_repo_path:
-                    print(f"Found GitTTY repository at: {gittty_repo_path}")
-                    pull_repository(gittty_repo_path)
-                    print(
-                        "\nUpdate complete. If there were any changes, please restart the application."
-                    )
-                else:
-                    print(
-                        "Could not find the GitTTY repository. This command only works if you installed via 'git clone'."
-                    )
-                continue
-            elif choice.lower() == "q":
+            if choice.lower() == "q":
                 break
-            else:
+
+            handler = _MENU_HANDLERS.get(choice)
+            if handler is None:
                 print("Invalid option.")
                 continue
 
+            repo_url = handler()
             if not repo_url:
                 continue
 
-            destination_path = get_destination_path_interactively()
-            if not destination_path:
-                print("The destination path cannot be empty. Please try again.")
-                continue
-
-            # Check what action to take based on destination
-            action = confirm_destination(destination_path)
-            if not action:
-                continue  # User cancelled
-            
-            if action == "pull":
-                # Pull the existing repository
-                if pull_repository(destination_path):
-                    print("Repository updated successfully!")
-                else:
-                    print("Failed to update repository.")
-                
-                another_op = get_user_input(
-                    "Do you want to perform another operation? (y/n)"
-                )
-                if another_op.lower() != "y":
-                    break
-                continue
-            
-            # If action == "clone", proceed with normal cloning
-            branch_or_tag = get_branch_or_tag_interactively()
-            shallow = ask_for_shallow_clone()
-
-            if clone_repository(repo_url, destination_path, branch_or_tag, shallow):
-                print("Operation completed.")
-
-                repo_name_from_url = repo_url.split("/")[-1].replace(".git", "")
-                cloned_repo_path = os.path.join(destination_path, repo_name_from_url)
-
-                run_script_choice = get_user_input(
-                    "Do you want to execute a script in the cloned repository? (y/n)"
-                )
-                if run_script_choice.lower() == "y":
-                    script_path = get_user_input(
-                        "Enter the relative path to the script (e.g., install.sh or scripts/setup.py)"
-                    )
-                    if script_path:
-                        execute_script_in_repo(script_path, cloned_repo_path)
-
-                save_choice = get_user_input(
-                    "Do you want to add this repository to the frequent list? (y/n)"
-                )
-                if save_choice.lower() == "y":
-                    repo_name = get_user_input(
-                        "Enter a friendly name for this repository"
-                    )
-                    if not repo_name:
-                        repo_name = repo_url
-                    add_frequent_repo(
-                        {"name": repo_name, "url": repo_url, "path": cloned_repo_path}
-                    )
-                    print("Repository saved to frequent list.")
-            else:
-                print("Cloning failed. Please check the URL and destination path.")
-
-            another_op = get_user_input(
-                "Do you want to perform another operation? (y/n)"
-            )
-            if another_op.lower() != "y":
+            if not _clone_or_update(repo_url):
                 break
 
     except KeyboardInterrupt:
@@ -268,25 +392,104 @@ def run_interactive_mode():
     print("\nThank you for using GitTTY! We hope we've helped you recover your system.")
 
 
-def main():
-    parser = argparse.ArgumentParser(
-        description="GitTTY: Your Git lifeline in a TTY environment.",
-        epilog="By default, GitTTY runs in an interactive mode with a menu-driven interface.",
+def _start():
+    """Checks for git and enters the interactive menu."""
+    from modules.git_operations import check_git_installed
+
+    if not check_git_installed():
+        sys.exit(1)
+    run_interactive_mode()
+
+
+def _build_parser():
+    """The command-line parser, which also produces the --help text."""
+    parser = argparse.ArgumentParser(description=_DESCRIPTION, epilog=_EPILOG)
+    parser.add_argument(
+        "--version", action="version", version=f"%(prog)s {__version__}"
+    )
+    clone_depth = parser.add_mutually_exclusive_group()
+    clone_depth.add_argument(
+        "--shallow",
+        dest="shallow",
+        action="store_const",
+        const=True,
+        help="always make shallow clones (--depth=1) without asking",
+    )
+    clone_depth.add_argument(
+        "--full-history",
+        dest="shallow",
+        action="store_const",
+        const=False,
+        help="always clone the full history without asking",
+    )
+    clone_filter = parser.add_mutually_exclusive_group()
+    clone_filter.add_argument(
+        "--blobless",
+        dest="clone_filter",
+        action="store_const",
+        const="blob:none",
+        help="partial clone: fetch file contents only on checkout",
+    )
+    clone_filter.add_argument(
+        "--treeless",
+        dest="clone_filter",
+        action="store_const",
+        const="tree:0",
+        help="partial clone: also download trees only when needed",
     )
     parser.add_argument(
-        "--version", action="version", version="%(prog)s 0.1.0"  # Simple versioning
+        "--no-checkout",
+        dest="checkout",
+        action="store_false",
+        help="clone without checking out files (with a filter: history only)",
     )
+    parser.add_argument(
+        "--single-branch",
+        action="store_true",
+        help="only fetch the history of the branch being cloned",
+    )
+    parser.add_argument(
+        "--recurse-submodules",
+        action="store_true",
+        help="also clone/pull submodules, several in parallel",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        metavar="N",
+        help="clone up to N saved repositories at once (default: 8)",
+    )
+    return parser
+
 
-    # This check is minimal. If any args are passed that aren't the ones we define,
-    # argparse will handle it (e.g., show help or an error).
-    # We just want to run interactively if NO args are given.
+def main():
+    global _shallow_override, _clone_filter_override, _single_branch
+    global _recurse_submodules, _clone_jobs, _checkout
+
+    # The common case is a bare launch: go straight to the menu without
+    # building an ArgumentParser.
     if len(sys.argv) == 1:
-        if not check_git_installed():
-            sys.exit(1)
-        run_interactive_mode()
-    else:
-        # Let argparse handle the arguments (--help, --version, or errors)
-        args = parser.parse_args()
+        _start()
+        return
+
+    # Answer --version without building the parser
+    if sys.argv[1:] == ["--version"]:
+        print(f"{os.path.basename(sys.argv[0])} {__version__}")
+        return
+
+    parser = _build_parser()
+    args = parser.parse_args()
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
+    _shallow_override = args.shallow
+    _clone_filter_override = args.clone_filter
+    _checkout = args.checkout
+    _single_branch = args.single_branch
+    _recurse_submodules = args.recurse_submodules
+    _clone_jobs = args.jobs
+    _start()
 
 
 if __name__ == "__main__":
@@ -4,16 +4,42 @@ Handles authentication and repository operations.
 """
 
 import requests
-import json
+import hashlib
+import os
+import tempfile
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
 from typing import List, Dict, Optional
+from urllib.parse import parse_qs, urlparse
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-try:
-    from rich.console import Console
-    RICH_AVAILABLE = True
-    console = Console()
-except ImportError:
-    RICH_AVAILABLE = False
-    console = None
+from modules.config_manager import CONFIG_DIR, json_dumps, json_loads
+
+
+@dataclass(frozen=True)
+class Repo:
+    """A repository as listed by a Git service."""
+    
+    # Explicit __slots__ (rather than dataclass(slots=True), which needs
+    # Python 3.10) keeps instances small for long repository lists
+    __slots__ = (
+        "name", "full_name", "description", "clone_url_https", "clone_url_ssh",
+        "private", "language", "stars", "forks", "updated_at", "default_branch",
+    )
+    
+    name: str
+    full_name: str
+    description: Optional[str]
+    clone_url_https: str
+    clone_url_ssh: str
+    private: bool
+    language: Optional[str]
+    stars: int
+    forks: int
+    updated_at: str
+    default_branch: str
 
 
 class GitAPIError(Exception):
@@ -21,31 +47,256 @@ class GitAPIError(Exception):
     pass
 
 
+# Pages of a repository list fetched at the same time
+MAX_PAGE_WORKERS = 8
+
+# Longest wait, in seconds, for a rate limit reset before giving up
+RATE_LIMIT_MAX_WAIT = 60
+
+
+# Shared sessions, one per service/host, so successive clients reuse the
+# keep-alive connections in the urllib3 pool instead of redoing TCP+TLS.
+_SESSIONS: Dict[str, requests.Session] = {}
+
+
+def _get_session(key: str) -> requests.Session:
+    """Return the shared Session for key, creating it on first use."""
+    session = _SESSIONS.get(key)
+    if session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=5,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=frozenset(["GET"]),
+                respect_retry_after_header=True,
+                # Hand the last response back so _make_request can report it
+                raise_on_status=False,
+            ),
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _SESSIONS[key] = session
+    return session
+
+
+# Entries not rewritten for this long, in seconds, are pruned from the disk caches
+DISK_CACHE_MAX_AGE = 30 * 24 * 3600
+
+
+class _DiskCache:
+    """
+    JSON entries on disk, one file per key (stored under a hash of it).
+    Entries hold API responses, private repositories included, so the
+    directory is 0700 and every file 0600. The first write of a session
+    prunes entries older than DISK_CACHE_MAX_AGE and all but the
+    max_entries most recent ones.
+    """
+    
+    def __init__(self, directory: str, max_entries: int):
+        self.directory = directory
+        self.max_entries = max_entries
+        self._pruned = False
+    
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(key.encode("utf-8")).hexdigest() + ".json")
+    
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the cached entry for key, or None."""
+        try:
+            with open(self._path(key), "rb") as f:
+                return json_loads(f.read())
+        except (OSError, ValueError):
+            return None
+    
+    def put(self, key: str, entry: Dict) -> None:
+        """Store entry for key; a full or read-only cache is never fatal."""
+        try:
+            os.makedirs(self.directory, mode=0o700, exist_ok=True)
+            if not self._pruned:
+                self._pruned = True
+                # Also tightens a directory created by older versions
+                os.chmod(self.directory, 0o700)
+                self._prune()
+            # mkstemp creates the file 0600; the rename keeps concurrent
+            # readers from seeing a half-written entry
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(json_dumps(entry))
+                os.replace(tmp_path, self._path(key))
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError:
+            pass
+    
+    def _prune(self) -> None:
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                try:
+                    entries.append((entry.stat().st_mtime, entry.path))
+                except OSError:
+                    pass
+        entries.sort(reverse=True)
+        cutoff = time.time() - DISK_CACHE_MAX_AGE
+        for i, (mtime, path) in enumerate(entries):
+            if i >= self.max_entries or mtime < cutoff or path.endswith(".tmp"):
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+
+
+# GET response bodies with their ETag/Last-Modified. GitHub answers a
+# matching If-None-Match with a body-less 304 that doesn't count against the
+# rate limit, so re-listing repositories is nearly free.
+_etag_cache = _DiskCache(os.path.join(CONFIG_DIR, "http_cache"), max_entries=500)
+
+# Stored with each body: pagination reads them, and a 304 may not repeat them
+_CACHED_HEADERS = ("Link", "X-Total-Pages", "X-Next-Page")
+
+# Each account's full repository list, so the browser can show the last
+# known list at once (even offline) while a fresh one loads
+_repo_list_cache = _DiskCache(os.path.join(CONFIG_DIR, "repo_cache"), max_entries=20)
+
+# Age, in seconds, under which a cached repository list is used as is
+REPO_CACHE_TTL = 300
+
+# Bumped whenever the stored Repo layout changes; older entries are ignored
+REPO_CACHE_VERSION = 1
+
+
+def _repo_list_key(client: "BaseGitClient") -> str:
+    # The token is part of the key: private repos differ per user
+    return f"{type(client).__name__}:{getattr(client, 'base_url', '')}\n{client._auth_headers.get('Authorization', '')}"
+
+
 class BaseGitClient:
     """Base class for Git service API clients."""
     
     def __init__(self, token: Optional[str] = None):
         self.token = token
-        self.session = requests.Session()
-        if token:
-            self.session.headers.update(self._get_auth_headers())
+        self.session = _get_session(f"{type(self).__name__}:{getattr(self, 'base_url', '')}")
+        # Sent per request, since the session is shared between tokens
+        self._auth_headers = self._get_auth_headers() if token else {}
     
     def _get_auth_headers(self) -> Dict[str, str]:
         """Get authentication headers. To be implemented by subclasses."""
         raise NotImplementedError
     
-    def _make_request(self, method: str, url: str, **kwargs) -> requests.Response:
+    def _last_page(self, response: requests.Response) -> Optional[int]:
+        """Number of the last page, from X-Total-Pages (GitLab) or the Link header (GitHub)."""
+        total_pages = response.headers.get("X-Total-Pages")
+        if total_pages and total_pages.isdigit():
+            return int(total_pages)
+        last = response.links.get("last")
+        if last:
+            page = parse_qs(urlparse(last["url"]).query).get("page")
+            if page and page[0].isdigit():
+                return int(page[0])
+        return None
+    
+    def _get_all_pages(self, url: str, params: Dict) -> List[Dict]:
+        """
+        GET every page of a paginated list endpoint and concatenate the results.
+        Once the first page tells us how many there are, the rest are fetched
+        in parallel over the shared keep-alive session.
+        """
+        response = self._make_request("GET", url, params=params)
+        items = json_loads(response.content)
+        
+        last_page = self._last_page(response)
+        if last_page is not None:
+            if last_page > 1:
+                def fetch(page):
+                    return json_loads(self._make_request("GET", url, params={**params, "page": page}).content)
+                
+                with ThreadPoolExecutor(max_workers=min(MAX_PAGE_WORKERS, last_page - 1)) as pool:
+                    for page_items in pool.map(fetch, range(2, last_page + 1)):
+                        items.extend(page_items)
+                # Offset pages of a list sorted by update time overlap when an
+                # item is updated mid-fetch; keep each one once
+                seen = set()
+                items = [item for item in items if item.get("id") not in seen and not seen.add(item.get("id"))]
+            return items
+        
+        # No page count advertised: follow rel="next" one page at a time
+        while "next" in response.links:
+            response = self._make_request("GET", response.links["next"]["url"])
+            items.extend(json_loads(response.content))
+        return items
+    
+    @staticmethod
+    def _rate_limit_wait(response: requests.Response) -> Optional[float]:
+        """Seconds until the rate limit resets, from X-RateLimit-Reset, if given."""
+        reset = response.headers.get("X-RateLimit-Reset")
+        if not reset:
+            return None
+        try:
+            return max(0.0, int(reset) - time.time())
+        except ValueError:
+            return None
+    
+    def _make_request(self, method: str, url: str, _retried: bool = False, **kwargs) -> requests.Response:
         """Make a request with error handling."""
         try:
-            response = self.session.request(method, url, timeout=10, **kwargs)
+            headers = {**self._auth_headers, **kwargs.get("headers", {})}
+            request_kwargs = {k: v for k, v in kwargs.items() if k != "headers"}
+            
+            cache_key = cached = None
+            if method == "GET":
+                # The token is part of the key: private repos differ per user
+                full_url = requests.Request(method, url, params=kwargs.get("params")).prepare().url
+                cache_key = f"{self._auth_headers.get('Authorization', '')}\n{full_url}"
+                cached = _etag_cache.get(cache_key)
+                if cached and "headers" not in cached:
+                    # Stored by an older version, without the pagination headers
+                    cached = None
+                if cached:
+                    if cached.get("etag"):
+                        headers["If-None-Match"] = cached["etag"]
+                    if cached.get("last_modified"):
+                        headers["If-Modified-Since"] = cached["last_modified"]
+            
+            response = self.session.request(method, url, timeout=10, headers=headers, **request_kwargs)
+            
+            if response.status_code == 304 and cached:
+                # Unchanged: serve the stored body as if it had been sent again
+                response._content = cached["body"].encode("utf-8")
+                response.encoding = "utf-8"
+                response.headers.update(cached.get("headers", {}))
+                response.status_code = 200
+            elif cache_key and response.status_code == 200:
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+                # Only a response with a validator can be revalidated later
+                if etag or last_modified:
+                    _etag_cache.put(cache_key, {
+                        "etag": etag,
+                        "last_modified": last_modified,
+                        "headers": {name: response.headers[name] for name in _CACHED_HEADERS if name in response.headers},
+                        "body": response.text,
+                    })
             
             if response.status_code == 401:
                 raise GitAPIError("Authentication failed. Please check your token.")
             elif response.status_code == 403:
                 if 'rate limit' in response.text.lower():
+                    wait = self._rate_limit_wait(response)
+                    if wait is not None and wait <= RATE_LIMIT_MAX_WAIT and not _retried:
+                        # The quota resets shortly; wait for it instead of failing
+                        time.sleep(wait)
+                        return self._make_request(method, url, _retried=True, **kwargs)
                     raise GitAPIError("Rate limit exceeded. Please try again later.")
                 else:
                     raise GitAPIError("Access forbidden. Check your token permissions.")
+            elif response.status_code == 429:
+                raise GitAPIError("Too many requests. Please try again later.")
             elif response.status_code == 404:
                 raise GitAPIError("Resource not found.")
             elif not response.ok:
@@ -74,7 +325,7 @@ class GitHubClient(BaseGitClient):
     def test_connection(self) -> Dict[str, str]:
         """Test the connection and get user info."""
         response = self._make_request("GET", f"{self.BASE_URL}/user")
-        user_data = response.json()
+        user_data = json_loads(response.content)
         return {
             "username": user_data.get("login"),
             "name": user_data.get("name"),
@@ -83,8 +334,8 @@ class GitHubClient(BaseGitClient):
             "private_repos": user_data.get("total_private_repos", 0)
         }
     
-    def get_repositories(self, per_page: int = 30, repo_type: str = "all") -> List[Dict]:
-        """Get user repositories."""
+    def get_repositories(self, per_page: int = 100, repo_type: str = "all") -> List[Repo]:
+        """Get all user repositories (100 per page is GitHub's maximum)."""
         params = {
             "per_page": per_page,
             "type": repo_type,  # all, owner, member
@@ -92,30 +343,29 @@ class GitHubClient(BaseGitClient):
             "direction": "desc"
         }
         
-        response = self._make_request("GET", f"{self.BASE_URL}/user/repos", params=params)
-        repos = response.json()
+        repos = self._get_all_pages(f"{self.BASE_URL}/user/repos", params)
         
         return [
-            {
-                "name": repo["name"],
-                "full_name": repo["full_name"],
-                "description": repo.get("description", ""),
-                "clone_url_https": repo["clone_url"],
-                "clone_url_ssh": repo["ssh_url"],
-                "private": repo["private"],
-                "language": repo.get("language"),
-                "stars": repo["stargazers_count"],
-                "forks": repo["forks_count"],
-                "updated_at": repo["updated_at"],
-                "default_branch": repo["default_branch"]
-            }
+            Repo(
+                repo["name"],
+                repo["full_name"],
+                repo.get("description", ""),
+                repo["clone_url"],
+                repo["ssh_url"],
+                repo["private"],
+                repo.get("language"),
+                repo["stargazers_count"],
+                repo["forks_count"],
+                repo["updated_at"],
+                repo["default_branch"],
+            )
             for repo in repos
         ]
     
     def get_repository_info(self, owner: str, repo: str) -> Dict:
         """Get detailed information about a specific repository."""
         response = self._make_request("GET", f"{self.BASE_URL}/repos/{owner}/{repo}")
-        repo_data = response.json()
+        repo_data = json_loads(response.content)
         
         return {
             "name": repo_data["name"],
@@ -154,7 +404,7 @@ class GitLabClient(BaseGitClient):
     def test_connection(self) -> Dict[str, str]:
         """Test the connection and get user info."""
         response = self._make_request("GET", f"{self.api_url}/user")
-        user_data = response.json()
+        user_data = json_loads(response.content)
         return {
             "username": user_data.get("username"),
             "name": user_data.get("name"),
@@ -163,8 +413,8 @@ class GitLabClient(BaseGitClient):
             "private_repos": "N/A"
         }
     
-    def get_repositories(self, per_page: int = 30, owned: bool = True) -> List[Dict]:
-        """Get user repositories."""
+    def get_repositories(self, per_page: int = 100, owned: bool = True) -> List[Repo]:
+        """Get all user repositories (100 per page is GitLab's maximum)."""
         params = {
             "per_page": per_page,
             "owned": str(owned).lower(),
@@ -172,30 +422,29 @@ class GitLabClient(BaseGitClient):
             "sort": "desc"
         }
         
-        response = self._make_request("GET", f"{self.api_url}/projects", params=params)
-        repos = response.json()
+        repos = self._get_all_pages(f"{self.api_url}/projects", params)
         
         return [
-            {
-                "name": repo["name"],
-                "full_name": repo["path_with_namespace"],
-                "description": repo.get("description", ""),
-                "clone_url_https": repo["http_url_to_repo"],
-                "clone_url_ssh": repo["ssh_url_to_repo"],
-                "private": repo.get("visibility", "private") == "private",
-                "language": None,  # GitLab doesn't provide primary language in list
-                "stars": repo.get("star_count", 0),
-                "forks": repo.get("forks_count", 0),
-                "updated_at": repo["last_activity_at"],
-                "default_branch": repo.get("default_branch", "main")
-            }
+            Repo(
+                repo["name"],
+                repo["path_with_namespace"],
+                repo.get("description", ""),
+                repo["http_url_to_repo"],
+                repo["ssh_url_to_repo"],
+                repo.get("visibility", "private") == "private",
+                None,  # GitLab doesn't provide primary language in list
+                repo.get("star_count", 0),
+                repo.get("forks_count", 0),
+                repo["last_activity_at"],
+                repo.get("default_branch", "main"),
+            )
             for repo in repos
         ]
     
     def get_repository_info(self, project_id: str) -> Dict:
         """Get detailed information about a specific repository."""
         response = self._make_request("GET", f"{self.api_url}/projects/{project_id}")
-        repo_data = response.json()
+        repo_data = json_loads(response.content)
         
         return {
             "name": repo_data["name"],
@@ -214,14 +463,21 @@ class GitLabClient(BaseGitClient):
         }
 
 
+# Supported services. This static table is the provider registry; nothing is
+# discovered through entry points at runtime. Each entry builds a client
+# from (token, gitlab_url); only GitLab has a configurable host.
+CLIENT_FACTORIES = {
+    "github": lambda token, gitlab_url: GitHubClient(token),
+    "gitlab": GitLabClient,
+}
+
+
 def create_client(service: str, token: str, gitlab_url: str = "https://gitlab.com") -> BaseGitClient:
     """Factory function to create appropriate API client."""
-    if service.lower() == "github":
-        return GitHubClient(token)
-    elif service.lower() == "gitlab":
-        return GitLabClient(token, gitlab_url)
-    else:
+    factory = CLIENT_FACTORIES.get(service.lower())
+    if factory is None:
         raise ValueError(f"Unsupported service: {service}")
+    return factory(token, gitlab_url)
 
 
 def test_token(service: str, token: str, gitlab_url: str = "https://gitlab.com") -> tuple[bool, str, Dict]:
@@ -234,3 +490,61 @@ def test_token(service: str, token: str, gitlab_url: str = "https://gitlab.com")
         return False, str(e), {}
     except Exception as e:
         return False, f"Unexpected error: {str(e)}", {}
+
+
+def test_tokens(tokens: Dict[str, str], gitlab_url: str = "https://gitlab.com") -> Dict[str, Future]:
+    """
+    Test every {service: token} at once, one thread each, so the total wait
+    is the slowest round trip rather than their sum.
+    Returns {service: Future}; result() gives test_token()'s tuple.
+    """
+    executor = ThreadPoolExecutor(max_workers=max(1, len(tokens)))
+    futures = {
+        service: executor.submit(test_token, service, token, gitlab_url)
+        for service, token in tokens.items()
+    }
+    executor.shutdown(wait=False)
+    return futures
+
+
+def cached_repositories(client: BaseGitClient) -> Optional[tuple[float, List[Repo]]]:
+    """Last stored (fetched_at, repos) for client, however old, or None."""
+    entry = _repo_list_cache.get(_repo_list_key(client))
+    try:
+        if entry and entry.get("version") == REPO_CACHE_VERSION:
+            return entry["fetched_at"], [Repo(*row) for row in entry["repos"]]
+    except (KeyError, TypeError):
+        pass
+    return None
+
+
+def fetch_repositories(client: BaseGitClient) -> List[Repo]:
+    """client.get_repositories(), keeping a copy in the repository list cache."""
+    repos = client.get_repositories()
+    _repo_list_cache.put(_repo_list_key(client), {
+        "version": REPO_CACHE_VERSION,
+        "fetched_at": time.time(),
+        "repos": [[getattr(repo, field) for field in Repo.__slots__] for repo in repos],
+    })
+    return repos
+
+
+def prefetch_repositories(clients: Dict[str, BaseGitClient], max_age: float = REPO_CACHE_TTL) -> Dict[str, Future]:
+    """
+    Start fetching every client's repository list in the background.
+    A cached list younger than max_age seconds is used without a request.
+    Returns {service: Future}; result() waits for that service's list and
+    re-raises its GitAPIError, if any.
+    """
+    executor = ThreadPoolExecutor(max_workers=max(1, len(clients)))
+    futures = {}
+    for service, client in clients.items():
+        cached = cached_repositories(client)
+        if cached is not None and time.time() - cached[0] < max_age:
+            futures[service] = Future()
+            futures[service].set_result(cached[1])
+        else:
+            futures[service] = executor.submit(fetch_repositories, client)
+    # Let the submitted fetches finish without keeping the pool around
+    executor.shutdown(wait=False)
+    return futures
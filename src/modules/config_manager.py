@@ -1,22 +1,109 @@
+import copy
 import os
 import json
+import pickle
 import shutil
+import stat
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 CONFIG_DIR = os.path.expanduser("~/.config/gittty")
 REPOS_FILE_JSON = os.path.join(CONFIG_DIR, "frequent_repos.json")
 CONFIG_FILE = os.path.join(CONFIG_DIR, "config.json")
 REPOS_FILE_TXT_OLD = os.path.join(CONFIG_DIR, "frequent_repos.txt")
+# Binary copy of REPOS_FILE_JSON; the JSON file stays the editable source of truth
+REPOS_CACHE_FILE = os.path.join(CONFIG_DIR, "frequent_repos.cache")
 
 DEFAULT_CLONE_DIR = os.path.expanduser("~/dotfiles")
 DEFAULT_THEME = "default"
+DEFAULT_SHALLOW_CLONE = True
+DEFAULT_OBJECT_CACHE = False
+# Partial clone filter ("blob:none", "tree:0"), or None for a regular clone
+DEFAULT_CLONE_FILTER = None
+# Share one SSH connection per host between git commands (opt-in: it adds
+# ControlMaster options on top of the user's ssh setup)
+DEFAULT_SSH_MULTIPLEXING = False
+# Bare repositories, one per host and owner/org, whose objects later clones can borrow
+OBJECT_CACHE_DIR = os.path.join(CONFIG_DIR, "object_cache")
+
+# Parsed contents of REPOS_FILE_JSON, reused until the file's mtime/size change.
+# "index" maps url -> position in the list "indexed" (built on first add).
+_repos_cache = {"mtime": None, "data": None, "index": None, "indexed": None}
+# Same for CONFIG_FILE
+_config_cache = {"mtime": None, "data": None}
+
+
+def json_loads(data):
+    """Parses JSON from bytes or str, using orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj):
+    """Serializes obj to indented JSON bytes, using orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode("utf-8")
+
+
+def _write_atomic(path, payload):
+    """
+    Writes payload to path unless the file already holds exactly those bytes.
+    The data goes to a temporary file first and is swapped in with
+    os.replace(), so a crash mid-write never leaves a truncated file behind.
+    Returns True if the file was written.
+    """
+    # New files are private to the user (config.json holds API tokens);
+    # existing ones keep whatever mode the user gave them
+    mode = 0o600
+    try:
+        with open(path, "rb") as f:
+            if f.read() == payload:
+                return False
+            mode = stat.S_IMODE(os.fstat(f.fileno()).st_mode)
+    except FileNotFoundError:
+        pass
+
+    tmp_path = path + ".tmp"
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+    try:
+        fd = os.open(tmp_path, flags, 0o600)
+    except FileNotFoundError:
+        # First save: create the config directory only when it's missing
+        os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+        fd = os.open(tmp_path, flags, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        # A .tmp left over by a crash keeps its old mode; set it explicitly
+        os.chmod(tmp_path, mode)
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return True
+
+
+def _remember(cache, path, data):
+    """Records data as the current contents of path, right after writing it."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        cache["mtime"] = None
+        return
+    cache["mtime"] = (st.st_mtime_ns, st.st_size)
+    cache["data"] = data
 
 
 def _migrate_from_txt_to_json():
     """Migrates the old .txt repo file to the new .json format."""
-    print("Migrating frequent repositories to new format...")
     try:
         with open(REPOS_FILE_TXT_OLD, "r") as f:
             urls = [line.strip() for line in f if line.strip()]
+        print("Migrating frequent repositories to new format...")
 
         # Add 'path': None to maintain data structure consistency
         repos = [{"name": url, "url": url, "path": None} for url in urls]
@@ -29,15 +116,62 @@ def _migrate_from_txt_to_json():
         return []
 
 
-def load_frequent_repos():
-    """Reads the frequent repositories file and returns a list of repo dictionaries."""
-    if not os.path.exists(REPOS_FILE_JSON):
-        if os.path.exists(REPOS_FILE_TXT_OLD):
-            return _migrate_from_txt_to_json()
-        return []
+def _read_repos_cache(stamp):
+    """
+    Returns the pickled repo list if it was made from the JSON file as it is
+    now (same mtime and size), else None.
+    """
     try:
-        with open(REPOS_FILE_JSON, "r") as f:
-            return json.load(f)
+        with open(REPOS_CACHE_FILE, "rb") as f:
+            cached = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        # A missing or unreadable cache is never fatal; fall back to the JSON file
+        return None
+    if not isinstance(cached, dict) or cached.get("stamp") != stamp:
+        return None
+    return cached.get("repos")
+
+
+def _write_repos_cache(repos):
+    """Stores a pickled copy of the repo list, stamped with the JSON file it mirrors."""
+    try:
+        st = os.stat(REPOS_FILE_JSON)
+        cached = {"stamp": (st.st_mtime_ns, st.st_size), "repos": repos}
+        with open(REPOS_CACHE_FILE, "wb") as f:
+            pickle.dump(cached, f, protocol=pickle.HIGHEST_PROTOCOL)
+    except (OSError, pickle.PicklingError):
+        pass  # e.g. read-only config dir: the JSON file is parsed next time
+
+
+def _cached_frequent_repos():
+    """
+    Returns the parsed frequent repositories list shared with the cache.
+    Callers must not modify it; load_frequent_repos() hands out copies.
+    """
+    try:
+        st = os.stat(REPOS_FILE_JSON)
+    except FileNotFoundError:
+        # Returns [] if there is no old .txt file either
+        return _migrate_from_txt_to_json()
+
+    # Menu loops call this on every redraw; skip the re-parse if nothing changed
+    stamp = (st.st_mtime_ns, st.st_size)
+    if _repos_cache["mtime"] == stamp:
+        return _repos_cache["data"]
+
+    repos = _read_repos_cache(stamp)
+    if repos is not None:
+        _repos_cache["mtime"] = stamp
+        _repos_cache["data"] = repos
+        return repos
+
+    try:
+        with open(REPOS_FILE_JSON, "rb") as f:
+            repos = json_loads(f.read())
+        _write_repos_cache(repos)
+        _repos_cache["mtime"] = stamp
+        _repos_cache["data"] = repos
+        return repos
     except (IOError, json.JSONDecodeError) as e:
         print(
             f"Warning: Could not read the frequent repositories file at '{REPOS_FILE_JSON}'."
@@ -57,29 +191,62 @@ def load_frequent_repos():
         return []  # Return an empty list to allow the program to continue
 
 
+def load_frequent_repos():
+    """Reads the frequent repositories file and returns a list of repo dictionaries."""
+    # A copy, so edits that are never saved can't leak into the cache
+    return [dict(repo) for repo in _cached_frequent_repos()]
+
+
 def save_frequent_repos(repos):
     """Saves the list of repo dictionaries to the file."""
-    os.makedirs(CONFIG_DIR, exist_ok=True)
-    with open(REPOS_FILE_JSON, "w") as f:
-        json.dump(repos, f, indent=4)
+    if _write_atomic(REPOS_FILE_JSON, json_dumps(repos)):
+        _write_repos_cache(repos)
+    # Only reached once the write succeeded; keep a copy the caller can't touch
+    _remember(_repos_cache, REPOS_FILE_JSON, [dict(repo) for repo in repos])
+
+
+def _url_index(repos):
+    """Returns a url -> position dict for repos, reusing it while the list is unchanged."""
+    if _repos_cache["indexed"] is not repos or _repos_cache["index"] is None:
+        index = {}
+        for i, repo in enumerate(repos):
+            # Keep the first entry for a URL, like a linear scan would
+            index.setdefault(repo.get("url"), i)
+        _repos_cache["index"] = index
+        _repos_cache["indexed"] = repos
+    return _repos_cache["index"]
+
+
+def find_frequent_repo(url):
+    """Returns the frequent repository saved with url, or None."""
+    repos = _cached_frequent_repos()
+    i = _url_index(repos).get(url)
+    return None if i is None else dict(repos[i])
+
+
+def add_frequent_repos(repos_to_add):
+    """Adds several repositories (or updates the paths of known ones) and saves once."""
+    cached = _cached_frequent_repos()
+    # Edit copies; the cache only changes once save_frequent_repos() succeeds
+    index = dict(_url_index(cached))
+    repos = [dict(repo) for repo in cached]
+
+    for repo_to_add in repos_to_add:
+        i = index.get(repo_to_add.get("url"))
+        if i is not None:
+            # If it exists, update its path
+            repos[i]["path"] = repo_to_add.get("path")
+        else:
+            # Otherwise, add the new repo
+            index[repo_to_add.get("url")] = len(repos)
+            repos.append(repo_to_add)
+
+    save_frequent_repos(repos)
 
 
 def add_frequent_repo(repo_to_add):
     """Adds a repository to the frequent list, or updates the path if it already exists."""
-    repos = load_frequent_repos()
-    # Check if a repo with the same URL already exists
-    existing_repo = next(
-        (repo for repo in repos if repo.get("url") == repo_to_add.get("url")), None
-    )
-
-    if existing_repo:
-        # If it exists, update its path
-        existing_repo["path"] = repo_to_add.get("path")
-    else:
-        # Otherwise, add the new repo
-        repos.append(repo_to_add)
-
-    save_frequent_repos(repos)
+    add_frequent_repos([repo_to_add])
 
 
 def remove_frequent_repo(index):
@@ -94,32 +261,60 @@ def remove_frequent_repo(index):
 
 def load_config():
     """Loads the main configuration file."""
-    if not os.path.exists(CONFIG_FILE):
+    try:
+        st = os.stat(CONFIG_FILE)
+    except FileNotFoundError:
         return {
             "default_clone_dir": DEFAULT_CLONE_DIR,
             "theme": DEFAULT_THEME,
+            "shallow_clone": DEFAULT_SHALLOW_CLONE,
+            "object_cache": DEFAULT_OBJECT_CACHE,
+            "clone_filter": DEFAULT_CLONE_FILTER,
+            "ssh_multiplexing": DEFAULT_SSH_MULTIPLEXING,
         }
+
+    # Every getter/setter goes through here; only re-parse when the file changed
+    stamp = (st.st_mtime_ns, st.st_size)
+    if _config_cache["mtime"] == stamp:
+        # A copy: setters edit what they get back, and a failed save must not
+        # leave those edits in the cache (api_tokens is nested, hence deepcopy)
+        return copy.deepcopy(_config_cache["data"])
+
     try:
-        with open(CONFIG_FILE, "r") as f:
-            config = json.load(f)
+        with open(CONFIG_FILE, "rb") as f:
+            config = json_loads(f.read())
             # Ensure all default values are present
             if "theme" not in config:
                 config["theme"] = DEFAULT_THEME
             if "default_clone_dir" not in config:
                 config["default_clone_dir"] = DEFAULT_CLONE_DIR
-            return config
+            if "shallow_clone" not in config:
+                config["shallow_clone"] = DEFAULT_SHALLOW_CLONE
+            if "object_cache" not in config:
+                config["object_cache"] = DEFAULT_OBJECT_CACHE
+            if "clone_filter" not in config:
+                config["clone_filter"] = DEFAULT_CLONE_FILTER
+            if "ssh_multiplexing" not in config:
+                config["ssh_multiplexing"] = DEFAULT_SSH_MULTIPLEXING
+            _config_cache["mtime"] = stamp
+            _config_cache["data"] = config
+            return copy.deepcopy(config)
     except (IOError, json.JSONDecodeError):
         return {
             "default_clone_dir": DEFAULT_CLONE_DIR,
             "theme": DEFAULT_THEME,
+            "shallow_clone": DEFAULT_SHALLOW_CLONE,
+            "object_cache": DEFAULT_OBJECT_CACHE,
+            "clone_filter": DEFAULT_CLONE_FILTER,
+            "ssh_multiplexing": DEFAULT_SSH_MULTIPLEXING,
         }
 
 
 def save_config(config):
     """Saves the main configuration file."""
-    os.makedirs(CONFIG_DIR, exist_ok=True)
-    with open(CONFIG_FILE, "w") as f:
-        json.dump(config, f, indent=4)
+    _write_atomic(CONFIG_FILE, json_dumps(config))
+    # Only reached once the write succeeded; keep a copy the caller can't touch
+    _remember(_config_cache, CONFIG_FILE, copy.deepcopy(config))
 
 
 def get_default_clone_dir():
@@ -148,6 +343,51 @@ def set_theme(theme_name):
     save_config(config)
 
 
+def get_shallow_clone():
+    """Gets whether new clones should be shallow by default."""
+    config = load_config()
+    return config.get("shallow_clone", DEFAULT_SHALLOW_CLONE)
+
+
+def set_shallow_clone(shallow):
+    """Sets whether new clones should be shallow by default."""
+    config = load_config()
+    config["shallow_clone"] = bool(shallow)
+    save_config(config)
+
+
+def get_object_cache():
+    """Gets whether clones should use and feed the local object cache."""
+    config = load_config()
+    return config.get("object_cache", DEFAULT_OBJECT_CACHE)
+
+
+def set_object_cache(enabled):
+    """Sets whether clones should use and feed the local object cache."""
+    config = load_config()
+    config["object_cache"] = bool(enabled)
+    save_config(config)
+
+
+def get_clone_filter():
+    """Gets the partial clone filter for new clones, or None."""
+    config = load_config()
+    return config.get("clone_filter", DEFAULT_CLONE_FILTER)
+
+
+def get_ssh_multiplexing():
+    """Gets whether git commands share one SSH connection per host."""
+    config = load_config()
+    return config.get("ssh_multiplexing", DEFAULT_SSH_MULTIPLEXING)
+
+
+def set_ssh_multiplexing(enabled):
+    """Sets whether git commands share one SSH connection per host."""
+    config = load_config()
+    config["ssh_multiplexing"] = bool(enabled)
+    save_config(config)
+
+
 def get_api_tokens():
     """Gets the stored API tokens from the config."""
     config = load_config()
@@ -1,84 +1,165 @@
+import asyncio
+import atexit
 import subprocess
 import os
+import pathlib
+import shlex
 import shutil
 import socket
-import itertools
+import stat
+import sys
 import threading
 import time
 import re
+from collections import deque
+from urllib.parse import urlparse
 
+# rich.progress is only imported once a clone/pull actually starts
 try:
-    from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn, TimeElapsedColumn, TimeRemainingColumn
     from rich.console import Console
-    from rich.live import Live
-    from rich.text import Text
     RICH_AVAILABLE = True
 except ImportError:
     RICH_AVAILABLE = False
 
 console = Console() if RICH_AVAILABLE else None
 
+# path -> (monotonic timestamp, exists) for cached_path_exists()
+_path_exists_cache = {}
+PATH_EXISTS_TTL = 5.0
+
+# First word of each progress line git prints -> (rest of its label, the
+# type parse_git_progress() reports)
+_PROGRESS_VERBS = {
+    "Receiving": ("objects:", "receiving"),
+    "Resolving": ("deltas:", "resolving"),
+    "Compressing": ("objects:", "compressing"),
+    "Decompressing": ("objects:", "decompressing"),
+}
+
+
 def parse_git_progress(line):
     """Parse git output to extract progress information."""
-    # Pattern for git clone progress: "Receiving objects: 45% (450/1000), 2.3 MiB | 1.2 MiB/s"
-    receiving_pattern = r"Receiving objects:\s*(\d+)%\s*\((\d+)/(\d+)\)(?:,\s*([\d.]+\s*[KMGT]?i?B)\s*\|\s*([\d.]+\s*[KMGT]?i?B/s))?"
-    
-    # Pattern for resolving deltas: "Resolving deltas: 67% (670/1000)"
-    resolving_pattern = r"Resolving deltas:\s*(\d+)%\s*\((\d+)/(\d+)\)"
-    
-    # Pattern for compression/decompression
-    compression_pattern = r"(Compressing|Decompressing) objects:\s*(\d+)%\s*\((\d+)/(\d+)\)"
-    
-    # Try to match receiving objects
-    match = re.search(receiving_pattern, line)
-    if match:
-        percent = int(match.group(1))
-        current = int(match.group(2))
-        total = int(match.group(3))
-        size = match.group(4) if match.group(4) else None
-        speed = match.group(5) if match.group(5) else None
-        return {
-            'type': 'receiving',
-            'percent': percent,
-            'current': current,
-            'total': total,
-            'size': size,
-            'speed': speed
-        }
-    
-    # Try to match resolving deltas
-    match = re.search(resolving_pattern, line)
-    if match:
-        percent = int(match.group(1))
-        current = int(match.group(2))
-        total = int(match.group(3))
-        return {
-            'type': 'resolving',
-            'percent': percent,
-            'current': current,
-            'total': total
-        }
-    
-    # Try to match compression
-    match = re.search(compression_pattern, line)
-    if match:
-        operation = match.group(1).lower()
-        percent = int(match.group(2))
-        current = int(match.group(3))
-        total = int(match.group(4))
-        return {
-            'type': operation,
-            'percent': percent,
-            'current': current,
-            'total': total
-        }
-    
-    return None
+    # Every progress line has a percentage; skip the rest
+    if "%" not in line:
+        return None
+
+    # Fixed grammar: "<label> NN% (N/N)[, <size> | <speed>]", so plain string
+    # slicing does the job without building match objects. The first word
+    # alone picks the kind of line.
+    verb, _, rest = line.lstrip().removeprefix("remote: ").partition(" ")
+    kind = _PROGRESS_VERBS.get(verb)
+    if kind is None:
+        return None
+    noun, task_type = kind
+    if not rest.startswith(noun):
+        return None
+
+    percent, _, rest = rest[len(noun):].partition("%")
+    percent = percent.strip()
+    open_paren = rest.find("(")
+    close_paren = rest.find(")", open_paren)
+    if open_paren == -1 or close_paren == -1 or rest[:open_paren].strip():
+        return None
+    current, _, total = rest[open_paren + 1:close_paren].partition("/")
+    if not (percent.isdecimal() and current.isdecimal() and total.isdecimal()):
+        return None
+
+    info = {
+        'type': task_type,
+        'percent': int(percent),
+        'current': int(current),
+        'total': int(total),
+    }
+    if task_type == 'receiving':
+        size = speed = None
+        tail = rest[close_paren + 1:]
+        if tail.startswith(","):
+            size, bar, speed = tail[1:].partition("|")
+            size = size.strip()
+            speed = speed.partition(",")[0].strip()
+            if not (bar and size and speed.endswith("B/s")):
+                size = speed = None
+        info['size'] = size
+        info['speed'] = speed
+    return info
+
+
+# Starts of git's percentage progress lines (after an optional "remote: ")
+_PROGRESS_PREFIXES = (
+    "Receiving objects",
+    "Resolving deltas",
+    "Compressing objects",
+    "Decompressing objects",
+    "Counting objects",
+    "Unpacking objects",
+    "Updating files",
+)
+
+
+def is_git_progress(line):
+    """
+    Cheaper than parse_git_progress() when only a yes/no is needed: a
+    prefix test instead of slicing out the numbers into a dict per line.
+    """
+    if "%" not in line:
+        return False
+    return line.lstrip().removeprefix("remote: ").startswith(_PROGRESS_PREFIXES)
+
+
+# Most bytes taken from the pipe per os.read(); it returns whatever is
+# already there, so a large size just means fewer reads when git is busy
+PIPE_READ_SIZE = 65536
+
+
+def iter_git_output(stream):
+    """
+    Yields the lines git writes to a raw (bytes, unbuffered) pipe, each
+    ending in "\n". A bare "\r", which git uses between progress updates, also
+    ends a line. Reading with os.read() skips the TextIOWrapper layer; git's
+    output is ASCII apart from file names, so lines are decoded one by one.
+    """
+    fd = stream.fileno()
+    pending = b""
+    while chunk := os.read(fd, PIPE_READ_SIZE):
+        lines = (pending + chunk).splitlines(keepends=True)
+        # An unfinished line, or a "\r" that may be half of "\r\n", waits
+        # for the next read
+        pending = lines.pop() if not lines[-1].endswith(b"\n") else b""
+        for line in lines:
+            yield line.rstrip(b"\r\n").decode(errors="replace") + "\n"
+    if pending:
+        yield pending.rstrip(b"\r\n").decode(errors="replace") + "\n"
+
+
+# Most redraws per second of the rich progress bars
+PROGRESS_REFRESH_HZ = 15
+
+# Non-progress output lines kept per git command, for the error message
+GIT_OUTPUT_TAIL = 200
+
 
 def advanced_progress_monitor(process, operation_name="Git Operation"):
-    """Monitor git process with advanced progress bars using rich."""
+    """
+    Monitor git process with advanced progress bars using rich.
+    The process must be started with stderr merged into stdout; its output
+    is drained as it arrives so git never blocks on a full pipe.
+    Returns the last GIT_OUTPUT_TAIL output lines that weren't progress
+    updates, so memory stays bounded however chatty git is.
+    """
     if not RICH_AVAILABLE:
-        return spinner_animation_fallback(process, operation_name)
+        return _drain_with_spinner(process, operation_name)
+
+    from rich.progress import (
+        Progress,
+        SpinnerColumn,
+        TextColumn,
+        BarColumn,
+        TaskProgressColumn,
+        TimeElapsedColumn,
+        TimeRemainingColumn,
+    )
+
+    messages = deque(maxlen=GIT_OUTPUT_TAIL)
     
     with Progress(
         SpinnerColumn(),
@@ -89,160 +170,385 @@ def advanced_progress_monitor(process, operation_name="Git Operation"):
         TimeElapsedColumn(),
         TimeRemainingColumn(),
         console=console,
-        transient=False
+        transient=False,
+        # Redrawn by hand below, at most PROGRESS_REFRESH_HZ times a second
+        auto_refresh=False,
     ) as progress:
         
         # Create initial task
         main_task = progress.add_task(f"[cyan]{operation_name}...", total=100, speed="")
         receiving_task = None
         resolving_task = None
+        last_refresh = 0.0
         
         # Read process output in real-time
-        while True:
-            output = process.stderr.readline() if process.stderr else ""
-            if output == "" and process.poll() is not None:
-                break
+        for output in iter_git_output(process.stdout):
+            # Parse the output for progress information; the parser
+            # finds its label anywhere in the line, so no strip() copy
+            progress_info = parse_git_progress(output)
             
-            if output:
-                # Parse the output for progress information
-                progress_info = parse_git_progress(output.strip())
+            if progress_info:
+                task_type = progress_info['type']
+                percent = progress_info['percent']
+                current = progress_info['current']
+                total = progress_info['total']
                 
-                if progress_info:
-                    task_type = progress_info['type']
-                    percent = progress_info['percent']
-                    current = progress_info['current']
-                    total = progress_info['total']
-                    
-                    if task_type == 'receiving':
-                        if receiving_task is None:
-                            receiving_task = progress.add_task(
-                                "[green]Receiving objects", 
-                                total=total, 
-                                speed=progress_info.get('speed', '')
-                            )
-                        
-                        progress.update(
-                            receiving_task, 
-                            completed=current, 
+                if task_type == 'receiving':
+                    if receiving_task is None:
+                        receiving_task = progress.add_task(
+                            "[green]Receiving objects", 
+                            total=total, 
                             speed=progress_info.get('speed', '')
                         )
-                        progress.update(main_task, completed=percent)
-                        
-                    elif task_type == 'resolving':
-                        if resolving_task is None:
-                            resolving_task = progress.add_task(
-                                "[yellow]Resolving deltas", 
-                                total=total,
-                                speed=""
-                            )
-                        
-                        progress.update(resolving_task, completed=current)
-                        progress.update(main_task, completed=min(90 + (percent * 0.1), 100))
                     
-                    elif task_type in ['compressing', 'decompressing']:
-                        operation_display = task_type.title()
-                        progress.update(
-                            main_task, 
-                            completed=percent,
-                            description=f"[cyan]{operation_display} objects..."
+                    progress.update(
+                        receiving_task, 
+                        completed=current, 
+                        speed=progress_info.get('speed', '')
+                    )
+                    progress.update(main_task, completed=percent)
+                    
+                elif task_type == 'resolving':
+                    if resolving_task is None:
+                        resolving_task = progress.add_task(
+                            "[yellow]Resolving deltas", 
+                            total=total,
+                            speed=""
                         )
-                else:
-                    # For lines without progress info, just show as activity
-                    if "done" in output.lower() or "complete" in output.lower():
-                        progress.update(main_task, completed=100)
-
-def spinner_animation_fallback(process, operation_name):
-    """Fallback spinner animation when rich is not available."""
-    spinner = itertools.cycle(['-', '/', '|', '\\'])
-    while process.poll() is None:
-        try:
-            print(f"  {next(spinner)} {operation_name}...", end='\r', flush=True)
-            time.sleep(0.1)
-        except (BrokenPipeError, OSError):
-            break
-    print(' ' * 50, end='\r', flush=True)  # Clear the line
+                    
+                    progress.update(resolving_task, completed=current)
+                    progress.update(main_task, completed=min(90 + (percent * 0.1), 100))
+                
+                elif task_type in ['compressing', 'decompressing']:
+                    operation_display = task_type.title()
+                    progress.update(
+                        main_task, 
+                        completed=percent,
+                        description=f"[cyan]{operation_display} objects..."
+                    )
+
+                # Task updates are cheap; drawing them is what costs, and
+                # git reports far more often than a terminal can show
+                now = time.monotonic()
+                if percent == 100 or now - last_refresh >= 1 / PROGRESS_REFRESH_HZ:
+                    progress.refresh()
+                    last_refresh = now
+            else:
+                # Progress lines with no bar of their own (Counting,
+                # Unpacking, Updating files...) aren't worth keeping
+                if not is_git_progress(output):
+                    messages.append(output)
+                # For lines without progress info, just show as activity
+                lowered = output.lower()
+                if "done" in lowered or "complete" in lowered:
+                    progress.update(main_task, completed=100)
+                    progress.refresh()
 
+    process.wait()
+    return "".join(messages)
 
-def spinner_animation(stop_event):
-    """Displays a spinner animation in the console."""
-    spinner = itertools.cycle(["-", "/", "|", "\\"])
-    while not stop_event.is_set():
+
+def _drain_with_spinner(process, operation_name):
+    """
+    Shows a spinner (on a terminal) while reading the merged output of
+    process to the end.
+    Returns the last GIT_OUTPUT_TAIL output lines that weren't progress updates.
+    """
+    stop_spinner = threading.Event()
+    spinner_thread = None
+    if _show_progress():
+        spinner_thread = threading.Thread(
+            target=spinner_animation, args=(stop_spinner, operation_name), daemon=True
+        )
+        spinner_thread.start()
+    try:
+        messages = deque(
+            (line for line in iter_git_output(process.stdout) if not is_git_progress(line)),
+            maxlen=GIT_OUTPUT_TAIL,
+        )
+        process.wait()
+    finally:
+        # The spinner wakes on the event, so it stops (and clears its line)
+        # right away
+        stop_spinner.set()
+        if spinner_thread is not None:
+            spinner_thread.join()
+    return "".join(messages)
+
+
+# Spinner frames are built once; 8 Hz is as fast as the eye needs
+SPINNER_CHARS = "-/|\\"
+SPINNER_INTERVAL = 0.125
+# Every frame is padded to this width, so one clear string covers any of them
+SPINNER_WIDTH = 40
+SPINNER_CLEAR = " " * SPINNER_WIDTH + "\r"
+
+
+def _spinner_frames(label):
+    """The four frames for a spinner showing label, padded to SPINNER_WIDTH."""
+    return [f"  {c} {label}...".ljust(SPINNER_WIDTH) + "\r" for c in SPINNER_CHARS]
+
+
+FRAMES = _spinner_frames("Processing")
+
+
+def spinner_animation(stop_event, operation_name=None):
+    """
+    Displays a spinner animation in the console until stop_event is set.
+    operation_name replaces the default "Processing" label.
+    """
+    frames = _spinner_frames(operation_name) if operation_name else FRAMES
+    i = 0
+    while True:
         try:
-            print(f"  {next(spinner)} Processing...", end="\r", flush=True)
-            time.sleep(0.1)
+            sys.stdout.write(frames[i & 3])
+            sys.stdout.flush()
         except (BrokenPipeError, OSError):
             # Handle cases where stdout is closed or unavailable
             break
+        i += 1
+        if stop_event.wait(SPINNER_INTERVAL):
+            break
     # Clear the spinner line
-    print(" " * 20, end="\r", flush=True)
+    _clear_spinner_line()
+
+
+def _clear_spinner_line():
+    try:
+        sys.stdout.write(SPINNER_CLEAR)
+        sys.stdout.flush()
+    except (BrokenPipeError, OSError):
+        pass
+
+
+# Known git failure messages (lowercase) and the explanation shown for each
+GIT_ERROR_MESSAGES = {
+    "could not resolve host": (
+        "Error: Could not resolve host.\n"
+        "Suggestion: Check your internet connection and DNS settings. Try to ping the host."
+    ),
+    "authentication failed": (
+        "Error: Authentication failed.\n"
+        "Suggestion: For HTTPS, check your username and password (or personal access token). For SSH, ensure your SSH key is correctly set up."
+    ),
+    "permission denied (publickey)": (
+        "Error: SSH Permission Denied.\n"
+        "Suggestion: Verify that your SSH key is added to your SSH agent and registered with your Git provider (e.g., GitHub, GitLab)."
+    ),
+    "repository not found": (
+        "Error: Repository not found.\n"
+        "Suggestion: Double-check the URL for typos. If it's a private repository, ensure you have the necessary permissions."
+    ),
+    "already exists and is not an empty directory": (
+        "Error: Destination path already exists and is not empty.\n"
+        "Suggestion: Please choose a different directory or remove the existing one if it's not needed."
+    ),
+    "your local changes to the following files would be overwritten by merge": (
+        "Error: Local changes would be overwritten by pull.\n"
+        "Suggestion: Stash or commit your local changes before pulling the updates. You can use 'git stash' to save them temporarily."
+    ),
+    "not a git repository": (
+        "Error: Not a Git repository.\n"
+        "Suggestion: Make sure you are in the correct directory that contains the .git folder."
+    ),
+}
+# One alternation scans the text once and reports the message that appears
+# earliest in it (not the earliest entry of the table)
+_GIT_ERROR_RE = re.compile(
+    "|".join(map(re.escape, GIT_ERROR_MESSAGES)), re.IGNORECASE
+)
 
 
 def translate_git_error(stderr):
     """
     Translates common Git error messages into more user-friendly explanations and suggestions.
     """
-    stderr_lower = stderr.lower()  # Case-insensitive matching
-
-    if "repository not found" in stderr_lower:
-        return (
-            "Error: Repository not found.\n"
-            "Suggestion: Double-check the URL for typos. If it's a private repository, ensure you have the necessary permissions."
-        )
-    if "authentication failed" in stderr_lower:
-        return (
-            "Error: Authentication failed.\n"
-            "Suggestion: For HTTPS, check your username and password (or personal access token). For SSH, ensure your SSH key is correctly set up."
-        )
-    if "permission denied (publickey)" in stderr_lower:
-        return (
-            "Error: SSH Permission Denied.\n"
-            "Suggestion: Verify that your SSH key is added to your SSH agent and registered with your Git provider (e.g., GitHub, GitLab)."
-        )
-    if "could not resolve host" in stderr_lower:
-        return (
-            "Error: Could not resolve host.\n"
-            "Suggestion: Check your internet connection and DNS settings. Try to ping the host."
-        )
-    if (
-        "your local changes to the following files would be overwritten by merge"
-        in stderr_lower
-    ):
-        return (
-            "Error: Local changes would be overwritten by pull.\n"
-            "Suggestion: Stash or commit your local changes before pulling the updates. You can use 'git stash' to save them temporarily."
-        )
-    if "not a git repository" in stderr_lower:
-        return (
-            "Error: Not a Git repository.\n"
-            "Suggestion: Make sure you are in the correct directory that contains the .git folder."
-        )
-    if "already exists and is not an empty directory" in stderr_lower:
-        return (
-            "Error: Destination path already exists and is not empty.\n"
-            "Suggestion: Please choose a different directory or remove the existing one if it's not needed."
-        )
+    # re.IGNORECASE matches without copying the text at all
+    match = _GIT_ERROR_RE.search(stderr)
+    if match:
+        return GIT_ERROR_MESSAGES[match.group(0).lower()]
 
     # Default fallback message
     return f"An unexpected Git error occurred. Raw error:\n---\n{stderr.strip()}\n---"
 
 
-def check_connectivity(host="8.8.8.8", port=53, timeout=3):
+# Monotonic time of the last successful connectivity probe
+_last_connectivity_ok = None
+CONNECTIVITY_TTL = 30.0
+
+
+def check_connectivity(host="8.8.8.8", port=53, timeout=1):
     """
     Check for internet connectivity by trying to connect to a known host.
     Returns True if connection is successful, False otherwise.
+    A successful probe is reused for CONNECTIVITY_TTL seconds; failures are
+    always re-probed so the user can retry as soon as the network is back.
     """
-    try:
-        socket.setdefaulttimeout(timeout)
-        socket.socket(socket.AF_INET, socket.SOCK_STREAM).connect((host, port))
+    global _last_connectivity_ok
+    now = time.monotonic()
+    if _last_connectivity_ok is not None and now - _last_connectivity_ok < CONNECTIVITY_TTL:
         return True
-    except socket.error as ex:
+    try:
+        # Probe an IP address directly so no DNS lookup is needed
+        with socket.create_connection((host, port), timeout=timeout):
+            pass
+    except OSError:
         print("Error: No internet connection detected.")
         return False
+    _last_connectivity_ok = now
+    return True
+
+
+# Resolved path of the git executable, filled in by get_git_executable()
+_GIT_PATH = None
+
+
+def get_git_executable():
+    """
+    Return the path of the git executable, resolving it on first use.
+    Falls back to plain "git" so Popen still reports a missing binary.
+    An absolute path also spares each spawn the exec-time PATH search; with
+    no preexec_fn or shell, CPython starts the child with vfork(), so the
+    parent's memory is never copied.
+    """
+    global _GIT_PATH
+    if _GIT_PATH is None:
+        _GIT_PATH = shutil.which("git") or "git"
+    return _GIT_PATH
+
+
+# (ssh_multiplexing, env) built by _git_env(); GitTTY never changes its own
+# environment, so only the opt-in SSH setting can make it stale
+_GIT_ENV = None
+
+
+def _git_env():
+    """
+    Environment for git commands whose output we capture. Credential prompts
+    are disabled so a missing login fails fast instead of hanging unseen.
+    LC_ALL=C keeps git's messages in English for translate_git_error(), and
+    GIT_OPTIONAL_LOCKS=0 lets read-only commands like status skip taking
+    the index lock.
+    """
+    global _GIT_ENV
+    from modules.config_manager import get_ssh_multiplexing
+
+    multiplexing = get_ssh_multiplexing()
+    if _GIT_ENV is None or _GIT_ENV[0] != multiplexing:
+        env = {
+            **os.environ,
+            "GIT_TERMINAL_PROMPT": "0",
+            "LC_ALL": "C",
+            "GIT_OPTIONAL_LOCKS": "0",
+        }
+        ssh_command = _ssh_multiplex_command(env) if multiplexing else None
+        if ssh_command:
+            env["GIT_SSH_COMMAND"] = ssh_command
+        _GIT_ENV = (multiplexing, env)
+    return _GIT_ENV[1]
+
+
+# How long a shared SSH connection outlives the last git command using it
+SSH_CONTROL_PERSIST = "60s"
+
+# An uncommented ControlMaster/ControlPath line in an ssh config file
+_SSH_CONTROL_RE = re.compile(rb"^[ \t]*Control(?:Master|Path)\b", re.IGNORECASE | re.MULTILINE)
+
+
+def _ssh_config_sets_control():
+    """True if the user's or the system's ssh config already sets up multiplexing."""
+    for path in (os.path.expanduser("~/.ssh/config"), "/etc/ssh/ssh_config"):
+        try:
+            with open(path, "rb") as f:
+                if _SSH_CONTROL_RE.search(f.read()):
+                    return True
+        except OSError:
+            pass
+    return False
+
+
+def _ssh_multiplex_command(env):
+    """
+    An ssh command that shares one authenticated connection per host, so
+    back-to-back clones and pulls over SSH skip the handshake. Returns None
+    when the user already picked an ssh command or configured multiplexing
+    themselves, or on Windows, where OpenSSH has no ControlMaster.
+    """
+    if os.name != "posix" or "GIT_SSH_COMMAND" in env or "GIT_SSH" in env:
+        return None
+    if _ssh_config_sets_control():
+        return None
+    # Only the scopes that don't depend on the current directory
+    for scope in ("--global", "--system"):
+        try:
+            configured = subprocess.run(
+                [get_git_executable(), "config", scope, "--get", "core.sshCommand"],
+                capture_output=True,
+                text=True,
+            ).stdout.strip()
+        except OSError:
+            return None
+        if configured:
+            return None
+
+    from modules.config_manager import CONFIG_DIR
+
+    control_dir = os.path.join(CONFIG_DIR, "ssh")
+    try:
+        os.makedirs(control_dir, mode=0o700, exist_ok=True)
+    except OSError:
+        return None
+    atexit.register(_close_ssh_masters, control_dir)
+    # %C hashes user, host and port into a short name, since unix socket
+    # paths are limited to about 100 bytes. git runs this through a shell.
+    return (
+        "ssh -o ControlMaster=auto"
+        f" -o ControlPersist={SSH_CONTROL_PERSIST}"
+        f" -o ControlPath={shlex.quote(os.path.join(control_dir, '%C'))}"
+    )
+
+
+def _close_ssh_masters(control_dir):
+    """Asks every shared SSH connection we started to exit, so none outlives GitTTY."""
+    try:
+        entries = os.scandir(control_dir)
+    except OSError:
+        return
+    with entries:
+        for entry in entries:
+            try:
+                if not stat.S_ISSOCK(entry.stat(follow_symlinks=False).st_mode):
+                    continue
+                # The host is required by the syntax but unused with -O
+                subprocess.run(
+                    ["ssh", "-o", f"ControlPath={entry.path}", "-O", "exit", "gittty"],
+                    capture_output=True,
+                    timeout=5,
+                )
+            except (OSError, subprocess.TimeoutExpired):
+                pass
+
+
+def _show_progress():
+    """
+    Whether to ask git for progress output and draw spinners. It is only
+    worth it on a terminal; otherwise git would stream updates that get read
+    and dropped. CI runners that fake a TTY are treated the same way, so
+    their logs don't fill up with \r frames.
+    """
+    if os.environ.get("CI"):
+        return False
+    try:
+        return sys.stdout.isatty()
+    except (AttributeError, ValueError):
+        return False
 
 
 def check_git_installed():
     """Checks if Git is installed and available in the system's PATH."""
-    if not shutil.which("git"):
+    # get_git_executable() only falls back to the bare name when the PATH
+    # lookup failed, and it does that lookup once per run
+    if get_git_executable() == "git":
         print(
             "Error: The 'git' command was not found. Please make sure Git is installed and in your PATH."
         )
@@ -250,56 +556,189 @@ def check_git_installed():
     return True
 
 
+def cached_path_exists(path):
+    """os.path.exists() memoized for PATH_EXISTS_TTL seconds, for repeated menu scans."""
+    now = time.monotonic()
+    cached = _path_exists_cache.get(path)
+    if cached and now - cached[0] < PATH_EXISTS_TTL:
+        return cached[1]
+    exists = os.path.exists(path)
+    _path_exists_cache[path] = (now, exists)
+    return exists
+
+
+def get_repo_name_from_url(repo_url):
+    """Returns the repository name from a clone URL (e.g. 'repo' for '.../repo.git')."""
+    tail = repo_url.rpartition("/")[2]
+    return tail[:-4] if tail.endswith(".git") else tail
+
+
 def is_git_repo(path):
     """Check if the given path is a git repository."""
-    return os.path.isdir(os.path.join(path, ".git"))
+    try:
+        return stat.S_ISDIR(os.stat(os.path.join(path, ".git")).st_mode)
+    except OSError:
+        return False
 
 
-def clone_repository(repo_url, destination_path, branch_or_tag=None, shallow=False):
+def _object_cache_path(repo_url):
     """
-    Executes the git clone command with advanced progress bars.
+    Path of the object cache for the host and owner/org of repo_url, or None
+    if the cache is disabled or the URL has no owner part.
+    Handles https://, ssh:// and scp-like (git@host:owner/repo.git) URLs.
     """
-    print(f"\nCloning '{repo_url}' into '{destination_path}'...")
+    from modules.config_manager import OBJECT_CACHE_DIR, get_object_cache
+
+    if not get_object_cache():
+        return None
+    if "://" in repo_url:
+        parsed = urlparse(repo_url)
+        host, path = parsed.hostname, parsed.path
+    else:
+        host, _, path = repo_url.partition(":")
+        host = host.rpartition("@")[2]
+    parts = [part for part in path.split("/") if part]
+    if not host or len(parts) < 2:
+        return None
+    # github.com/foo and gitlab.com/foo are different owners
+    return os.path.join(OBJECT_CACHE_DIR, host.lower(), parts[-2] + ".git")
+
+
+def _seed_object_cache(cache_path, repo_path):
+    """
+    Copies the objects of a fresh clone into its owner's object cache,
+    creating the bare cache repository first if needed. Runs in a daemon
+    thread, and a failure only means the next clone downloads a bit more.
+    """
+    git = get_git_executable()
+    name = os.path.basename(os.path.normpath(repo_path))
+    # A local fetch from a complete clone: nothing goes over the network
+    fetch = ["fetch", "--quiet", "--no-tags", repo_path, f"+HEAD:refs/cached/{name}"]
+    try:
+        if os.path.isdir(cache_path):
+            # Objects only become reachable once the fetch updates the ref,
+            # so an interrupted fetch leaves the cache as it was
+            subprocess.run([git, "--git-dir", cache_path, *fetch], capture_output=True)
+            return
+        # A new cache is filled next to its final path and renamed into
+        # place, so an exit mid-fetch never leaves a half-seeded cache for
+        # --reference-if-able to pick up
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f"{cache_path}.tmp-{os.getpid()}"
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        subprocess.run([git, "init", "--bare", "--quiet", tmp_path], check=True, capture_output=True)
+        subprocess.run([git, "--git-dir", tmp_path, *fetch], check=True, capture_output=True)
+        try:
+            os.rename(tmp_path, cache_path)
+        except OSError:
+            # Another clone created it first
+            shutil.rmtree(tmp_path, ignore_errors=True)
+    except (OSError, subprocess.CalledProcessError):
+        pass
+
 
-    command = ["git", "clone", "--progress"]
+# Parallel jobs for fetching submodules
+SUBMODULE_JOBS = 8
+
+
+def _clone_command(repo_url, destination_path, branch_or_tag=None, shallow=False,
+                   clone_filter=None, checkout=True, progress=False,
+                   recurse_submodules=False, jobs=None, single_branch=False):
+    """Builds the git clone argument list."""
+    jobs = jobs or SUBMODULE_JOBS
+    # Protocol v2 (the default only since git 2.26) only advertises the refs
+    # we ask for, and partial clone filters need it
+    command = [
+        get_git_executable(),
+        "-c", "protocol.version=2",
+        "-c", f"submodule.fetchJobs={jobs}",
+        "-c", "fetch.parallel=0",
+        "clone",
+    ]
+    command.append("--progress" if progress else "--no-progress")
+    if recurse_submodules:
+        command.extend(["--recurse-submodules", "-j", str(jobs)])
+        # Stored in the new repository, so later pulls fetch in parallel too
+        command.extend(["--config", f"submodule.fetchJobs={jobs}"])
+        if shallow:
+            command.append("--shallow-submodules")
     if branch_or_tag:
         command.extend(["--branch", branch_or_tag])
     if shallow:
-        command.extend(["--depth", "1"])
+        command.extend(["--depth=1", "--single-branch", "--no-tags"])
+    elif single_branch:
+        command.append("--single-branch")
+    if clone_filter:
+        command.append(f"--filter={clone_filter}")
+    if not checkout:
+        command.append("--no-checkout")
+    cache_path = _object_cache_path(repo_url)
+    if cache_path:
+        # Borrow objects we already have locally. --dissociate copies them
+        # into the new clone, so deleting the cache never breaks a checkout.
+        command.extend(["--reference-if-able", cache_path, "--dissociate"])
     command.extend([repo_url, destination_path])
+    return command
+
+
+def clone_repository(repo_url, destination_path, branch_or_tag=None, shallow=None,
+                     clone_filter=None, checkout=True, recurse_submodules=False,
+                     jobs=None, single_branch=False):
+    """
+    Executes the git clone command with advanced progress bars.
+    A shallow clone fetches only the tip of a single branch, without tags.
+    If shallow is None, the "shallow_clone" config setting decides.
+    clone_filter makes a partial clone ("blob:none" skips file contents until
+    they are checked out, "tree:0" skips trees too); if None, the
+    "clone_filter" config setting is used. checkout=False leaves the working
+    tree empty. recurse_submodules also clones submodules, jobs (default
+    SUBMODULE_JOBS) at a time. single_branch keeps the full history of just
+    the branch being cloned (shallow clones are always single-branch).
+    A filter keeps history while skipping contents; on a shallow clone there
+    is little history left, so it saves much less.
+    """
+    from modules.config_manager import get_clone_filter, get_shallow_clone
+
+    if shallow is None:
+        shallow = get_shallow_clone()
+    if clone_filter is None:
+        clone_filter = get_clone_filter()
+
+    print(f"\nCloning '{repo_url}' into '{destination_path}'...")
+
+    command = _clone_command(
+        repo_url, destination_path, branch_or_tag, shallow,
+        clone_filter=clone_filter, checkout=checkout, progress=_show_progress(),
+        recurse_submodules=recurse_submodules, jobs=jobs,
+        single_branch=single_branch,
+    )
 
     try:
         # Execute the git command with real-time progress monitoring
+        # git reports progress on stderr; merging it into stdout leaves a
+        # single pipe to drain, so a full stderr buffer can't stall the clone
         process = subprocess.Popen(
             command, 
             stdout=subprocess.PIPE, 
-            stderr=subprocess.PIPE, 
-            text=True,
-            bufsize=1,  # Line buffered
-            universal_newlines=True
+            stderr=subprocess.STDOUT, 
+            env=_git_env(),
+            bufsize=0,  # Raw pipe, read by iter_git_output()
         )
 
-        # Monitor progress
-        if RICH_AVAILABLE:
-            advanced_progress_monitor(process, "Cloning repository")
-        else:
-            # Fallback to simple spinner in a thread
-            stop_spinner = threading.Event()
-            spinner_thread = threading.Thread(
-                target=lambda: spinner_animation_fallback(process, "Cloning repository")
-            )
-            spinner_thread.start()
-            
-            # Wait for process to complete
-            process.wait()
-            stop_spinner.set()
-            if spinner_thread.is_alive():
-                spinner_thread.join(timeout=1)
-
-        # Get final output
-        stdout, stderr = process.communicate() if process.poll() is None else ("", "")
+        # Monitor progress (falls back to a spinner without rich)
+        output = advanced_progress_monitor(process, "Cloning repository")
 
         if process.returncode == 0:
+            cache_path = _object_cache_path(repo_url)
+            # A shallow repository can't serve as a reference, and fetching
+            # from a partial one would download its missing objects, so only
+            # full clones feed the cache
+            if cache_path and not shallow and not clone_filter:
+                threading.Thread(
+                    target=_seed_object_cache,
+                    args=(cache_path, destination_path),
+                    daemon=True,
+                ).start()
             if RICH_AVAILABLE:
                 console.print("✅ Repository cloned successfully!", style="bold green")
             else:
@@ -308,10 +747,10 @@ def clone_repository(repo_url, destination_path, branch_or_tag=None, shallow=Fal
         else:
             if RICH_AVAILABLE:
                 console.print("❌ Error cloning repository", style="bold red")
-                console.print(translate_git_error(stderr))
+                console.print(translate_git_error(output))
             else:
                 print("\n❌ Error cloning repository")
-                print(translate_git_error(stderr))
+                print(translate_git_error(output))
             return False
             
     except Exception as e:
@@ -322,23 +761,207 @@ def clone_repository(repo_url, destination_path, branch_or_tag=None, shallow=Fal
         return False
 
 
+# Upper bound on simultaneous clones in clone_many()
+MAX_CLONE_JOBS = 8
+
+
+async def _clone_captured(repo_url, destination_path, shallow, branch_or_tag=None, **clone_options):
+    """
+    Runs git clone without progress output. clone_options are passed on to
+    _clone_command().
+    Returns a (success, stdout, stderr) tuple.
+    """
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *_clone_command(repo_url, destination_path, branch_or_tag, shallow=shallow, **clone_options),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env=_git_env(),
+        )
+    except OSError as e:
+        return False, "", str(e)
+    stdout, stderr = await process.communicate()
+    return (
+        process.returncode == 0,
+        stdout.decode(errors="replace"),
+        stderr.decode(errors="replace"),
+    )
+
+
+async def _clone_many_async(repos, workers, shallow, clone_options):
+    """
+    Clones repos on one event loop, at most workers at a time, with a single
+    spinner showing how many clones are in flight.
+    """
+    slots = asyncio.Semaphore(workers)
+    running = 0
+    succeeded = 0
+
+    async def clone(repo):
+        nonlocal running, succeeded
+        async with slots:
+            running += 1
+            try:
+                success, _, stderr = await _clone_captured(
+                    repo["url"], repo["path"], shallow, repo.get("branch"), **clone_options
+                )
+            finally:
+                running -= 1
+        name = repo.get("name") or get_repo_name_from_url(repo["url"])
+        _clear_spinner_line()
+        if success:
+            succeeded += 1
+            print(f"✅ {name} -> {repo['path']}")
+        else:
+            print(f"❌ {name}: {translate_git_error(stderr)}")
+
+    clones = [asyncio.create_task(clone(repo)) for repo in repos]
+    await _gather_with_spinner(clones, lambda: running)
+    return succeeded
+
+
+async def _gather_with_spinner(tasks, in_flight):
+    """
+    Waits for tasks while one spinner shows in_flight(), the number of them
+    currently running.
+    """
+
+    async def spin():
+        i = 0
+        while True:
+            try:
+                sys.stdout.write(f"  {SPINNER_CHARS[i & 3]} {in_flight()} running...\r")
+                sys.stdout.flush()
+            except (BrokenPipeError, OSError):
+                return
+            i += 1
+            await asyncio.sleep(SPINNER_INTERVAL)
+
+    spinner = asyncio.create_task(spin()) if _show_progress() else None
+    try:
+        return await asyncio.gather(*tasks)
+    finally:
+        if spinner is not None:
+            spinner.cancel()
+            _clear_spinner_line()
+
+
+def clone_many(repos, max_workers=None, shallow=None, clone_filter=None,
+               checkout=True, recurse_submodules=False, single_branch=False):
+    """
+    Clones several repositories in parallel.
+    repos is a list of {"name", "url", "path"} dicts, as stored in the
+    frequent repositories file; each one is cloned into its "path", at its
+    optional "branch". The other options mean the same as for
+    clone_repository(), including the config fallbacks of shallow and
+    clone_filter.
+    Prints one line per repository as it finishes and returns the number
+    of successful clones.
+    """
+    if not repos:
+        return 0
+    from modules.config_manager import get_clone_filter, get_shallow_clone
+
+    if shallow is None:
+        shallow = get_shallow_clone()
+    if clone_filter is None:
+        clone_filter = get_clone_filter()
+    clone_options = {
+        "clone_filter": clone_filter,
+        "checkout": checkout,
+        "recurse_submodules": recurse_submodules,
+        "single_branch": single_branch,
+    }
+
+    workers = max_workers or min(MAX_CLONE_JOBS, len(repos))
+    print(f"\nCloning {len(repos)} repositories ({workers} at a time)...")
+
+    # Live progress from several clones would interleave, so each clone's
+    # output is captured and summarized once it is done
+    succeeded = asyncio.run(_clone_many_async(repos, workers, shallow, clone_options))
+
+    print(f"\n{succeeded} of {len(repos)} repositories cloned.")
+    return succeeded
+
+
+# Upper bound on simultaneous pulls in pull_many()
+MAX_PULL_JOBS = 4
+
+
+async def _pull_many_async(repo_paths, workers, recurse_submodules):
+    slots = asyncio.Semaphore(workers)
+    running = 0
+    submodule_options = ("--recurse-submodules", "-j", str(SUBMODULE_JOBS)) if recurse_submodules else ()
+
+    async def pull(repo_path):
+        nonlocal running
+        async with slots:
+            running += 1
+            try:
+                # --ff-only: a batch can't stop to ask about merges
+                process = await asyncio.create_subprocess_exec(
+                    get_git_executable(), "-C", repo_path,
+                    "pull", "--ff-only", "--no-progress", *submodule_options,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.STDOUT,
+                    env=_git_env(),
+                )
+                output, _ = await process.communicate()
+            except OSError as e:
+                return repo_path, False, str(e)
+            finally:
+                running -= 1
+        if process.returncode == 0:
+            return repo_path, True, ""
+        return repo_path, False, translate_git_error(output.decode(errors="replace"))
+
+    pulls = [asyncio.create_task(pull(path)) for path in repo_paths]
+    return await _gather_with_spinner(pulls, lambda: running)
+
+
+def pull_many(repo_paths, max_workers=None, recurse_submodules=False):
+    """
+    Pulls several repositories in parallel, fast-forward only.
+    recurse_submodules also updates their submodules.
+    Returns a list of (path, success, error message) tuples in the order of
+    repo_paths.
+    """
+    if not repo_paths:
+        return []
+    workers = max_workers or min(MAX_PULL_JOBS, len(repo_paths))
+    return asyncio.run(_pull_many_async(repo_paths, workers, recurse_submodules))
+
+
+# Largest chunk of script output copied to the terminal at a time
+SCRIPT_READ_SIZE = 65536
+
+
 def execute_script_in_repo(script_path, repo_path):
     """Executes a script within a given repository directory."""
     full_script_path = os.path.join(repo_path, script_path)
 
-    if not os.path.exists(full_script_path):
-        print(f"Error: Script '{full_script_path}' not found.")
+    # One stat covers existence and file type
+    try:
+        st = os.stat(full_script_path)
+    except OSError:
+        print(f"Error: Script '{full_script_path}' not found or not accessible.")
+        return False
+    if not stat.S_ISREG(st.st_mode):
+        print(f"Error: '{full_script_path}' is not a file.")
         return False
 
-    # Check for execute permissions
+    # Check for execute permissions (for this user, not just any mode bit)
     if not os.access(full_script_path, os.X_OK):
         print(
             f"Warning: Script '{full_script_path}' does not have execute permissions."
         )
+        # Imported here: user_interface already imports this module
+        from modules.user_interface import is_yes
+
         choice = input("Attempt to add execute permissions and run? (y/n)")
-        if choice.lower() == "y":
+        if is_yes(choice):
             try:
-                os.chmod(full_script_path, os.stat(full_script_path).st_mode | 0o111)
+                os.chmod(full_script_path, st.st_mode | 0o111)
                 print("Execute permissions added.")
             except OSError as e:
                 print(f"Error setting execute permissions: {e}")
@@ -353,15 +976,20 @@ def execute_script_in_repo(script_path, repo_path):
             [full_script_path],
             cwd=repo_path,
             stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
+            stderr=subprocess.STDOUT,
         )
 
-        # Real-time output
-        for line in process.stdout:
-            print(line, end="")
-        for line in process.stderr:
-            print(line, end="")
+        # Real-time output; stderr is merged in so neither pipe can fill up.
+        # read1() hands over whatever the pipe holds, so output is copied in
+        # big chunks rather than decoded and printed line by line.
+        sys.stdout.flush()
+        out = getattr(sys.stdout, "buffer", None)
+        while chunk := process.stdout.read1(SCRIPT_READ_SIZE):
+            if out is not None:
+                out.write(chunk)
+                out.flush()
+            else:
+                print(chunk.decode(errors="replace"), end="", flush=True)
 
         process.wait()
 
@@ -379,9 +1007,13 @@ def execute_script_in_repo(script_path, repo_path):
         return False
 
 
-def pull_repository(repo_path):
-    """Executes git pull with advanced progress monitoring."""
-    if not os.path.isdir(os.path.join(repo_path, ".git")):
+def pull_repository(repo_path, recurse_submodules=False, jobs=None):
+    """
+    Executes git pull with advanced progress monitoring.
+    recurse_submodules also updates submodules, jobs (default SUBMODULE_JOBS)
+    at a time.
+    """
+    if not is_git_repo(repo_path):
         error_msg = f"Error: '{repo_path}' is not a valid Git repository."
         if RICH_AVAILABLE:
             console.print(error_msg, style="bold red")
@@ -396,22 +1028,25 @@ def pull_repository(repo_path):
 
     try:
         # First, check if there are uncommitted changes
-        status_process = subprocess.Popen(
-            ["git", "status", "--porcelain"], 
-            cwd=repo_path, 
-            stdout=subprocess.PIPE, 
-            stderr=subprocess.PIPE, 
-            text=True
-        )
-        status_output, _ = status_process.communicate()
-        
-        has_changes = bool(status_output.strip())
+        status_output = subprocess.run(
+            [get_git_executable(), "status", "--porcelain"],
+            cwd=repo_path,
+            env=_git_env(),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            check=False,
+        ).stdout
         
-        if has_changes:
+        # Asked once: the same answer decides the stash and the pop after
+        # the pull
+        stashed = False
+        if status_output.strip():
             if RICH_AVAILABLE:
                 console.print("⚠️  Uncommitted changes detected", style="yellow")
             
-            # Import here to avoid circular imports
+            # Import here to avoid circular imports (user_interface imports
+            # this module); after the first pull it is a sys.modules lookup
             from modules.user_interface import ask_to_stash_changes
             
             if ask_to_stash_changes():
@@ -421,14 +1056,16 @@ def pull_repository(repo_path):
                 else:
                     print("Stashing local changes...")
                 
-                stash_process = subprocess.Popen(
-                    ["git", "stash", "push", "-m", "GitTTY auto-stash before pull"],
+                # Output isn't shown, and unread pipes could fill up and
+                # stall git, so it goes to /dev/null
+                stash_process = subprocess.run(
+                    [get_git_executable(), "stash", "push", "-m", "GitTTY auto-stash before pull"],
                     cwd=repo_path,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    text=True
+                    env=_git_env(),
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    check=False,
                 )
-                stash_process.wait()
                 
                 if stash_process.returncode != 0:
                     if RICH_AVAILABLE:
@@ -436,49 +1073,43 @@ def pull_repository(repo_path):
                     else:
                         print("Failed to stash changes")
                     return False
+                stashed = True
 
         # Execute git pull with progress
+        command = [
+            get_git_executable(), "pull",
+            "--progress" if _show_progress() else "--no-progress",
+        ]
+        if recurse_submodules:
+            command.extend(["--recurse-submodules", "-j", str(jobs or SUBMODULE_JOBS)])
         process = subprocess.Popen(
-            ["git", "pull", "--progress"], 
+            command, 
             cwd=repo_path, 
             stdout=subprocess.PIPE, 
-            stderr=subprocess.PIPE, 
-            text=True,
-            bufsize=1,
-            universal_newlines=True
+            stderr=subprocess.STDOUT, 
+            env=_git_env(),
+            bufsize=0,  # Raw pipe, read by iter_git_output()
         )
 
-        # Monitor progress
-        if RICH_AVAILABLE:
-            advanced_progress_monitor(process, "Pulling updates")
-        else:
-            # Fallback to simple spinner
-            spinner_thread = threading.Thread(
-                target=lambda: spinner_animation_fallback(process, "Pulling updates")
-            )
-            spinner_thread.start()
-            process.wait()
-            if spinner_thread.is_alive():
-                spinner_thread.join(timeout=1)
-
-        stdout, stderr = process.communicate() if process.poll() is None else ("", "")
+        # Monitor progress (falls back to a spinner without rich)
+        output = advanced_progress_monitor(process, "Pulling updates")
 
         if process.returncode == 0:
             # If we stashed changes, try to pop them back
-            if has_changes and ask_to_stash_changes():
+            if stashed:
                 if RICH_AVAILABLE:
                     console.print("📦 Restoring stashed changes...", style="blue")
                 else:
                     print("Restoring stashed changes...")
                 
-                pop_process = subprocess.Popen(
-                    ["git", "stash", "pop"],
+                pop_process = subprocess.run(
+                    [get_git_executable(), "stash", "pop"],
                     cwd=repo_path,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    text=True
+                    env=_git_env(),
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    check=False,
                 )
-                pop_process.wait()
                 
                 if pop_process.returncode != 0:
                     if RICH_AVAILABLE:
@@ -491,16 +1122,16 @@ def pull_repository(repo_path):
             else:
                 print("✅ Repository updated successfully!")
             
-            if stdout.strip():
-                print(stdout.strip())
+            if output.strip():
+                print(output.strip())
             return True
         else:
             if RICH_AVAILABLE:
                 console.print("❌ Error pulling repository", style="bold red")
-                console.print(translate_git_error(stderr))
+                console.print(translate_git_error(output))
             else:
                 print("\n❌ Error pulling repository")
-                print(translate_git_error(stderr))
+                print(translate_git_error(output))
             return False
 
     except Exception as e:
@@ -511,19 +1142,27 @@ def pull_repository(repo_path):
         return False
 
 
+# Memoized get_repo_root() result; the empty string means "not in a repo"
+_REPO_ROOT = None
+
+
 def get_repo_root():
     """Finds the root directory of the GitTTY repository."""
+    global _REPO_ROOT
+    if _REPO_ROOT is None:
+        _REPO_ROOT = _find_repo_root() or ""
+    return _REPO_ROOT or None
+
+
+def _find_repo_root():
     try:
         # Start from the directory of the current script
-        current_dir = os.path.dirname(os.path.realpath(__file__))
-        # Go up until we find a .git directory
-        while current_dir != "/":
-            if os.path.isdir(os.path.join(current_dir, ".git")):
-                return current_dir
-            current_dir = os.path.dirname(current_dir)
-        return None  # Reached root without finding .git
-    except Exception:
+        start = pathlib.Path(__file__).resolve().parent
+    except NameError:
         # Fallback for environments where __file__ is not defined
-        if os.path.isdir(os.path.join(os.getcwd(), ".git")):
-            return os.getcwd()
-        return None
+        start = pathlib.Path.cwd()
+    # Path.parents ends at the filesystem root on every platform
+    for ancestor in (start, *start.parents):
+        if (ancestor / ".git").is_dir():
+            return str(ancestor)
+    return None  # Reached root without finding .git
@@ -3,21 +3,54 @@ Theme management for GitTTY.
 Provides predefined color schemes and theme management functionality.
 """
 
+import functools
+from dataclasses import dataclass
+from enum import IntEnum
+from types import MappingProxyType
+from typing import Tuple
+
+
+class ColorKey(IntEnum):
+    """Position of each color in Theme.colors."""
+
+    HEADER = 0
+    INFO = 1
+    CYAN = 2
+    SUCCESS = 3
+    WARNING = 4
+    ERROR = 5
+    RESET = 6
+    BOLD = 7
+    UNDERLINE = 8
+
+
+@dataclass(frozen=True)
 class Theme:
     """Base theme class that defines the color scheme interface."""
-    
-    def __init__(self, name, colors):
-        self.name = name
-        self.colors = colors
-    
+
+    # Explicit __slots__, as dataclass(slots=True) needs Python 3.10
+    __slots__ = ("name", "colors")
+
+    name: str
+    # One ANSI escape per ColorKey, in ColorKey order
+    colors: Tuple[str, ...]
+
     def get_color(self, color_name):
-        """Get a specific color from the theme."""
-        return self.colors.get(color_name, "")
+        """Get a specific color from the theme, by ColorKey or by name."""
+        if isinstance(color_name, str):
+            key = ColorKey.__members__.get(color_name.upper())
+            return "" if key is None else self.colors[key]
+        return self.colors[color_name]
+
+
+def _theme(name, colors):
+    """Builds a Theme from a {color name: ANSI escape} dict."""
+    return Theme(name, tuple(colors[key.name.lower()] for key in ColorKey))
 
 
 # Predefined themes
-THEMES = {
-    "default": Theme("Default", {
+THEMES = MappingProxyType({
+    "default": _theme("Default", {
         "header": "\033[95m",
         "info": "\033[94m", 
         "cyan": "\033[96m",
@@ -29,7 +62,7 @@ THEMES = {
         "underline": "\033[4m",
     }),
     
-    "dark": Theme("Dark", {
+    "dark": _theme("Dark", {
         "header": "\033[38;5;141m",      # Purple
         "info": "\033[38;5;75m",         # Light Blue
         "cyan": "\033[38;5;87m",         # Bright Cyan
@@ -41,7 +74,7 @@ THEMES = {
         "underline": "\033[4m",
     }),
     
-    "light": Theme("Light", {
+    "light": _theme("Light", {
         "header": "\033[38;5;55m",       # Dark Purple
         "info": "\033[38;5;25m",         # Dark Blue
         "cyan": "\033[38;5;30m",         # Dark Cyan
@@ -53,7 +86,7 @@ THEMES = {
         "underline": "\033[4m",
     }),
     
-    "cyberpunk": Theme("Cyberpunk", {
+    "cyberpunk": _theme("Cyberpunk", {
         "header": "\033[38;5;201m",      # Hot Pink
         "info": "\033[38;5;51m",         # Neon Cyan
         "cyan": "\033[38;5;14m",         # Bright Cyan
@@ -65,7 +98,7 @@ THEMES = {
         "underline": "\033[4m",
     }),
     
-    "ocean": Theme("Ocean", {
+    "ocean": _theme("Ocean", {
         "header": "\033[38;5;24m",       # Deep Blue
         "info": "\033[38;5;39m",         # Sky Blue
         "cyan": "\033[38;5;45m",         # Aqua
@@ -77,7 +110,7 @@ THEMES = {
         "underline": "\033[4m",
     }),
     
-    "forest": Theme("Forest", {
+    "forest": _theme("Forest", {
         "header": "\033[38;5;22m",       # Forest Green
         "info": "\033[38;5;34m",         # Green
         "cyan": "\033[38;5;43m",         # Light Green
@@ -89,7 +122,7 @@ THEMES = {
         "underline": "\033[4m",
     }),
     
-    "mono": Theme("Monochrome", {
+    "mono": _theme("Monochrome", {
         "header": "\033[1m",             # Bold only
         "info": "\033[0m",               # Normal
         "cyan": "\033[0m",               # Normal
@@ -99,13 +132,16 @@ THEMES = {
         "reset": "\033[0m",
         "bold": "\033[1m",
         "underline": "\033[4m",
-    })
-}
+    }),
+})
+
+# THEMES is read-only, so its names can be listed once
+THEME_NAMES = tuple(THEMES)
 
 
 def get_available_themes():
-    """Get a list of all available theme names."""
-    return list(THEMES.keys())
+    """Get a tuple of all available theme names."""
+    return THEME_NAMES
 
 
 def get_theme(theme_name):
@@ -113,13 +149,22 @@ def get_theme(theme_name):
     return THEMES.get(theme_name, THEMES["default"])
 
 
-def get_theme_preview(theme_name):
-    """Get a preview string showing what the theme looks like."""
-    theme = get_theme(theme_name)
+# Themes never change, so each preview is built once
+@functools.lru_cache(maxsize=None)
+def get_theme_preview(theme_name, color=True):
+    """
+    Get a preview string showing what the theme looks like.
+    With color=False (output that isn't a terminal) it has no escape codes.
+    """
+    if color:
+        colors = get_theme(theme_name).colors
+    else:
+        colors = ("",) * len(ColorKey)
+    reset = colors[ColorKey.RESET]
     return (
-        f"{theme.get_color('header')}■ Header{theme.get_color('reset')} "
-        f"{theme.get_color('info')}■ Info{theme.get_color('reset')} "
-        f"{theme.get_color('success')}■ Success{theme.get_color('reset')} "
-        f"{theme.get_color('warning')}■ Warning{theme.get_color('reset')} "
-        f"{theme.get_color('error')}■ Error{theme.get_color('reset')}"
+        f"{colors[ColorKey.HEADER]}■ Header{reset} "
+        f"{colors[ColorKey.INFO]}■ Info{reset} "
+        f"{colors[ColorKey.SUCCESS]}■ Success{reset} "
+        f"{colors[ColorKey.WARNING]}■ Warning{reset} "
+        f"{colors[ColorKey.ERROR]}■ Error{reset}"
     )
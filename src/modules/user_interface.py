@@ -1,82 +1,113 @@
-from prompt_toolkit import prompt
-from prompt_toolkit.shortcuts import radiolist_dialog, confirm
-from prompt_toolkit.styles import Style
-from prompt_toolkit.completion import PathCompleter
+import functools
 import os
-from modules.config_manager import get_default_clone_dir, set_default_clone_dir, get_theme, set_theme, load_frequent_repos
-from modules.git_operations import is_git_repo, pull_repository
-from modules.themes import get_theme as get_theme_object, get_available_themes, get_theme_preview
-
-try:
-    from fuzzywuzzy import fuzz, process
-    FUZZY_SEARCH_AVAILABLE = True
-except ImportError:
-    FUZZY_SEARCH_AVAILABLE = False
-
-try:
-    from rich.console import Console
-    from rich.panel import Panel
-    from rich.text import Text
-    RICH_UI_AVAILABLE = True
-    ui_console = Console()
-except ImportError:
-    RICH_UI_AVAILABLE = False
-    ui_console = None
+import stat
+import sys
+import time
+from modules.config_manager import (
+    get_default_clone_dir, set_default_clone_dir, get_theme, set_theme, load_frequent_repos,
+    get_ssh_multiplexing, set_ssh_multiplexing, get_object_cache, set_object_cache,
+    get_shallow_clone, set_shallow_clone,
+)
+from modules.themes import ColorKey, get_theme as get_theme_object, get_available_themes, get_theme_preview
+
+# Fuzzy matching library, imported on the first search by
+# _get_fuzzy_backend(); False once we know neither is installed
+_fuzzy_backend = None
+
+# Minimum fuzzy match score (0-100) for a repository to show up in a search
+FUZZY_SCORE_CUTOFF = 60
+# Most fuzzy matches listed; the libraries then only keep the top ones
+FUZZY_RESULTS_LIMIT = 20
+# A search with at least this many plain substring hits skips fuzzy matching,
+# and so does a query of SHORT_QUERY_LENGTH characters or fewer
+SUBSTRING_MATCHES_ENOUGH = 5
+SHORT_QUERY_LENGTH = 3
+
+# rich Console for the enhanced screens, created by _get_console() the first
+# time one is shown; False once we know rich isn't installed
+_ui_console = None
+
+
+def _get_console():
+    global _ui_console
+    if _ui_console is None:
+        try:
+            from rich.console import Console
+        except ImportError:
+            _ui_console = False
+        else:
+            _ui_console = Console()
+    return _ui_console
+
+# Escape codes are only worth writing to a terminal; redirected output gets none
+_COLOR_OUTPUT = sys.stdout.isatty()
 
 
 class Colors:
-    """Dynamic color class that loads colors from the current theme."""
-    
-    @staticmethod
-    def _get_current_theme():
+    """
+    Dynamic color class that loads colors from the current theme.
+    The colors are plain instance attributes, filled in from the theme the
+    first time one is read; invalidate() clears them after a theme change.
+    When stdout is not a terminal every color is the empty string.
+    """
+
+    # Attribute name -> theme color
+    _NAMES = {
+        "HEADER": ColorKey.HEADER,
+        "OKBLUE": ColorKey.INFO,
+        "OKCYAN": ColorKey.CYAN,
+        "OKGREEN": ColorKey.SUCCESS,
+        "WARNING": ColorKey.WARNING,
+        "FAIL": ColorKey.ERROR,
+        "ENDC": ColorKey.RESET,
+        "BOLD": ColorKey.BOLD,
+        "UNDERLINE": ColorKey.UNDERLINE,
+    }
+
+    def _get_current_theme(self):
         """Get the current theme object."""
-        theme_name = get_theme()
-        return get_theme_object(theme_name)
-    
-    @property
-    def HEADER(self):
-        return self._get_current_theme().get_color("header")
-    
-    @property
-    def OKBLUE(self):
-        return self._get_current_theme().get_color("info")
-    
-    @property
-    def OKCYAN(self):
-        return self._get_current_theme().get_color("cyan")
-    
-    @property
-    def OKGREEN(self):
-        return self._get_current_theme().get_color("success")
-    
-    @property
-    def WARNING(self):
-        return self._get_current_theme().get_color("warning")
-    
-    @property
-    def FAIL(self):
-        return self._get_current_theme().get_color("error")
-    
-    @property
-    def ENDC(self):
-        return self._get_current_theme().get_color("reset")
-    
-    @property
-    def BOLD(self):
-        return self._get_current_theme().get_color("bold")
-    
-    @property
-    def UNDERLINE(self):
-        return self._get_current_theme().get_color("underline")
+        return get_theme_object(get_theme())
+
+    def _refresh(self):
+        """Copies every color of the current theme into an attribute."""
+        if not _COLOR_OUTPUT:
+            for name in self._NAMES:
+                setattr(self, name, "")
+            return
+        theme_colors = self._get_current_theme().colors
+        for name, key in self._NAMES.items():
+            setattr(self, name, theme_colors[key])
+
+    def __getattr__(self, name):
+        # Only called for attributes that aren't set yet
+        if name not in self._NAMES:
+            raise AttributeError(name)
+        self._refresh()
+        return getattr(self, name)
+
+    def invalidate(self):
+        """Forget the cached colors, so the next one comes from the config."""
+        for name in self._NAMES:
+            self.__dict__.pop(name, None)
 
 
 # Create a global instance
 colors = Colors()
 
+# On bare consoles, read input with a plain readline() instead of input()
+_DUMB_TERMINAL = os.environ.get("TERM", "") in ("", "dumb", "linux")
+
+# Horizontal rule under menus and around the welcome banner
+_HRULE = "-" * 50
+
 
 def display_welcome():
     """Displays a welcome message on the TTY."""
-    if RICH_UI_AVAILABLE:
+    ui_console = _get_console()
+    if ui_console:
+        from rich.panel import Panel
+        from rich.text import Text
+        
         # Rich enhanced welcome
         title = Text("GitTTY - Your Git Lifeline", style="bold magenta")
         subtitle = Text("Clone your essential repositories directly from the TTY", style="italic cyan")
@@ -90,33 +121,137 @@ def display_welcome():
         ui_console.print()
     else:
         # Fallback to traditional display
-        print(
-            f"{colors.HEADER}--------------------------------------------------{colors.ENDC}"
-        )
-        print(
-            f"{colors.HEADER}       Welcome to GitTTY - Your Git lifeline      {colors.ENDC}"
-        )
-        print(
-            f"{colors.HEADER}--------------------------------------------------{colors.ENDC}"
-        )
-        print("Clone your essential repositories directly from the TTY.\n")
+        sys.stdout.write(_welcome_banner(get_theme()))
+
+
+@functools.lru_cache(maxsize=None)
+def _welcome_banner(theme_name):
+    """The plain-text welcome banner in a theme's colors, built once per theme."""
+    if _COLOR_OUTPUT:
+        theme_colors = get_theme_object(theme_name).colors
+        header, reset = theme_colors[ColorKey.HEADER], theme_colors[ColorKey.RESET]
+    else:
+        header = reset = ""
+    rule = f"{header}{_HRULE}{reset}\n"
+    return (
+        f"{rule}"
+        f"{header}       Welcome to GitTTY - Your Git lifeline      {reset}\n"
+        f"{rule}"
+        "Clone your essential repositories directly from the TTY.\n\n"
+    )
 
 
 def get_user_input(prompt):
     """Gets text input from the user."""
+    if _DUMB_TERMINAL:
+        sys.stdout.write(f"{prompt}: ")
+        sys.stdout.flush()
+        line = sys.stdin.readline()
+        if not line:
+            raise EOFError  # Same as input() at end of input
+        return line.strip()
     return input(f"{prompt}: ").strip()
 
 
+def is_yes(answer):
+    """Returns True if a y/n answer starts with 'y' or 'Y' (so "Yes" counts)."""
+    return answer[:1] in ("y", "Y")
+
+
+def parse_menu_number(choice):
+    """Returns a menu choice as an int, or None if it isn't a number."""
+    try:
+        return int(choice)
+    except ValueError:
+        return None
+
+
+def parse_menu_index(choice, count):
+    """
+    Converts a 1-based menu choice into a 0-based index.
+    Returns None if the choice is not a number between 1 and count.
+    """
+    number = parse_menu_number(choice)
+    if number is None:
+        return None
+    return number - 1 if 1 <= number <= count else None
+
+
+# URL prefixes for the "Build from a preset" option
+PROVIDER_BASE_URLS = {
+    "github_https": "https://github.com/",
+    "github_ssh": "git@github.com:",
+    "gitlab_https": "https://gitlab.com/",
+    "gitlab_ssh": "git@gitlab.com:",
+}
+
+# Fixed choices for the radiolist dialogs below
+_URL_METHOD_VALUES = (
+    ("quick", "Build from a preset (e.g., GitHub)"),
+    ("manual", "Enter the full URL manually"),
+)
+_PROVIDER_VALUES = (
+    ("github_https", "GitHub (HTTPS)"),
+    ("github_ssh", "GitHub (SSH)"),
+    ("gitlab_https", "GitLab (HTTPS)"),
+    ("gitlab_ssh", "GitLab (SSH)"),
+)
+
+# Seconds a directory listing from the path completer stays valid
+COMPLETION_TTL = 2.0
+
+# PromptSession shared by the path prompts, built by _get_path_session() the
+# first time one is shown
+_path_session = None
+
+
+def _get_path_session():
+    """
+    Returns the PromptSession for path prompts. Reusing it keeps one
+    Application (and one history of typed paths) instead of building a new
+    one per prompt. Its completer remembers results per typed prefix for
+    COMPLETION_TTL seconds, runs in a background thread so a slow disk
+    never blocks typing, and only fires on Tab.
+    """
+    global _path_session
+    if _path_session is not None:
+        return _path_session
+
+    from prompt_toolkit import PromptSession
+    from prompt_toolkit.completion import PathCompleter, ThreadedCompleter
+
+    class CachedPathCompleter(PathCompleter):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self._cache = {}
+
+        def get_completions(self, document, complete_event):
+            text = document.text_before_cursor
+            now = time.monotonic()
+            cached = self._cache.get(text)
+            if cached and now - cached[0] < COMPLETION_TTL:
+                return cached[1]
+            if len(self._cache) >= 64:
+                self._cache.clear()  # Typed prefixes only pile up; start over
+            completions = list(super().get_completions(document, complete_event))
+            self._cache[text] = (now, completions)
+            return completions
+
+    _path_session = PromptSession(
+        completer=ThreadedCompleter(CachedPathCompleter(expanduser=True)),
+        complete_while_typing=False,
+    )
+    return _path_session
+
+
 def get_repo_url_interactively():
     """Asks the user to build or enter a repo URL interactively."""
+    from prompt_toolkit.shortcuts import radiolist_dialog
 
     url_method = radiolist_dialog(
         title="Repository URL",
         text="How do you want to provide the repository URL?",
-        values=[
-            ("quick", "Build from a preset (e.g., GitHub)"),
-            ("manual", "Enter the full URL manually"),
-        ],
+        values=_URL_METHOD_VALUES,
     ).run()
 
     if url_method == "manual":
@@ -126,29 +261,17 @@ def get_repo_url_interactively():
         base_url_key = radiolist_dialog(
             title="Select a Provider",
             text="Select the Git hosting provider:",
-            values=[
-                ("github_https", "GitHub (HTTPS)"),
-                ("github_ssh", "GitHub (SSH)"),
-                ("gitlab_https", "GitLab (HTTPS)"),
-                ("gitlab_ssh", "GitLab (SSH)"),
-            ],
+            values=_PROVIDER_VALUES,
         ).run()
 
         if not base_url_key:
             return None
 
-        base_urls = {
-            "github_https": "https://github.com/",
-            "github_ssh": "git@github.com:",
-            "gitlab_https": "https://gitlab.com/",
-            "gitlab_ssh": "git@gitlab.com:",
-        }
-
         repo_path = get_user_input(
-            f"Enter the repository path (e.g., owner/repo.git) for {base_urls[base_url_key]}"
+            f"Enter the repository path (e.g., owner/repo.git) for {PROVIDER_BASE_URLS[base_url_key]}"
         )
         if repo_path:
-            return base_urls[base_url_key] + repo_path
+            return PROVIDER_BASE_URLS[base_url_key] + repo_path
 
     return None  # Return None if user cancels
 
@@ -158,6 +281,8 @@ def get_destination_path_interactively():
     Asks for a destination path, offering a default and manual entry.
     If the path doesn't exist, it will be created by the clone operation.
     """
+    from prompt_toolkit.shortcuts import radiolist_dialog
+
     # Get the default path from config
     default_path = get_default_clone_dir()
 
@@ -177,12 +302,7 @@ def get_destination_path_interactively():
     if choice == "default":
         destination_path = default_path
     elif choice == "manual":
-        completer = PathCompleter(expanduser=True)
-        path_input = prompt(
-            "Enter the destination path: ",
-            completer=completer,
-            complete_while_typing=True,
-        )
+        path_input = _get_path_session().prompt("Enter the destination path: ")
         if path_input:
             destination_path = os.path.expanduser(path_input)
 
@@ -202,13 +322,24 @@ def confirm_destination(path):
     Checks if a destination path exists and provides appropriate warnings.
     Returns 'clone', 'pull', or None.
     """
-    if os.path.exists(path):
-        if os.path.isdir(path) and os.listdir(path):
+    from prompt_toolkit.shortcuts import confirm
+    from modules.git_operations import is_git_repo
+
+    try:
+        mode = os.stat(path).st_mode
+    except OSError:
+        return "clone"  # Path doesn't exist, so proceed with clone.
+
+    if stat.S_ISDIR(mode):
+        # One directory entry is enough to know it isn't empty
+        with os.scandir(path) as entries:
+            empty = next(entries, None) is None
+        if not empty:
             if is_git_repo(path):
                 print(
                     f"{colors.OKCYAN}The destination '{path}' is already a Git repository.{colors.ENDC}"
                 )
-                if confirm("Do you want to pull the latest changes instead?").run():
+                if confirm("Do you want to pull the latest changes instead?"):
                     return "pull"
                 else:
                     return None  # User chose not to pull
@@ -218,128 +349,150 @@ def confirm_destination(path):
                 )
                 if confirm(
                     "Do you want to attempt to clone into this directory anyway?"
-                ).run():
+                ):
                     return "clone"  # User chose to proceed with cloning
                 else:
                     return None  # User chose not to proceed
-        elif os.path.isfile(path):
-            print(
-                f"{colors.FAIL}Error: The destination path '{path}' exists and is a file. Please choose a different path.{colors.ENDC}"
-            )
-            return None
-    return "clone"  # Path doesn't exist or is an empty dir, so proceed with clone.
+    elif stat.S_ISREG(mode):
+        print(
+            f"{colors.FAIL}Error: The destination path '{path}' exists and is a file. Please choose a different path.{colors.ENDC}"
+        )
+        return None
+    return "clone"  # Empty directory, so proceed with clone.
 
 
 def get_branch_or_tag_interactively():
-    """Asks the user if they want to specify a branch or tag."""
-    if confirm("Do you want to specify a specific branch or tag to clone?"):
-        branch = prompt("Enter the branch or tag name: ")
-        return branch
-    return None
+    """Asks for a branch or tag to clone; an empty answer means the default branch."""
+    from prompt_toolkit import prompt
+
+    branch = prompt("Branch or tag to clone (leave empty for the default branch): ")
+    return branch.strip() or None
 
 
 def ask_for_shallow_clone():
     """Asks the user if they want to perform a shallow clone."""
+    from prompt_toolkit.shortcuts import confirm
+
     return confirm(
         "Do you want to perform a shallow clone? (Downloads only the latest version, faster for large repos)"
     )
 
 
+def _change_default_clone_dir():
+    """Shows the default clone directory and lets the user edit it in place."""
+    current_dir = get_default_clone_dir()
+    print(f"\nCurrent default clone directory: {colors.OKCYAN}{current_dir}{colors.ENDC}")
+    
+    # Pre-filled with the current value: Enter keeps it, an empty line does too
+    new_dir = _get_path_session().prompt(
+        "New default clone directory (Enter to keep it): ",
+        default=current_dir,
+    ).strip()
+    if new_dir and new_dir != current_dir:
+        new_dir = os.path.expanduser(new_dir)
+        set_default_clone_dir(new_dir)
+        print(f"{colors.OKGREEN}Default clone directory updated to: {new_dir}{colors.ENDC}")
+
+
+def _on_off(enabled):
+    """Menu label for a boolean setting."""
+    return "on" if enabled else "off"
+
+
+def _toggle_setting(label, getter, setter):
+    """Flips an on/off setting and reports its new state."""
+    enabled = not getter()
+    setter(enabled)
+    print(f"{colors.OKGREEN}{label} {'enabled' if enabled else 'disabled'}.{colors.ENDC}")
+
+
 def manage_settings():
     """Display the settings menu."""
     while True:
-        print(f"\n{colors.HEADER}--- Settings ---{colors.ENDC}")
-        print("1. Change default clone directory")
-        print("2. Change theme")
-        print("3. API integrations (GitHub/GitLab)")
-        print("4. Back to main menu")
-        print("-------------------")
+        sys.stdout.write(
+            f"\n{colors.HEADER}--- Settings ---{colors.ENDC}\n"
+            "1. Change default clone directory\n"
+            "2. Change theme\n"
+            "3. API integrations (GitHub/GitLab)\n"
+            f"4. SSH connection sharing: {_on_off(get_ssh_multiplexing())}\n"
+            f"5. Local object cache: {_on_off(get_object_cache())}\n"
+            f"6. Shallow clones when not asked: {_on_off(get_shallow_clone())}\n"
+            "7. Back to main menu\n"
+            "-------------------\n"
+        )
+        sys.stdout.flush()
         
         choice = input("Select an option: ").strip()
         
-        if choice == "1":
-            current_dir = get_default_clone_dir()
-            print(f"\nCurrent default clone directory: {colors.OKCYAN}{current_dir}{colors.ENDC}")
-            
-            if confirm("Do you want to change the default clone directory?").run():
-                new_dir = prompt(
-                    "Enter the new default clone directory: ",
-                    default=current_dir,
-                    completer=PathCompleter(),
-                )
-                if new_dir:
-                    set_default_clone_dir(os.path.expanduser(new_dir))
-                    print(f"{colors.OKGREEN}Default clone directory updated to: {os.path.expanduser(new_dir)}{colors.ENDC}")
-        
-        elif choice == "2":
-            manage_theme_settings()
-        
-        elif choice == "3":
-            manage_api_integrations()
-        
-        elif choice == "4":
+        action = _SETTINGS_ACTIONS.get(choice)
+        if action:
+            action()
+        elif choice == "7":
             break
-        
         else:
             print(f"{colors.WARNING}Invalid option. Please try again.{colors.ENDC}")
 
 
 def manage_theme_settings():
     """Manage theme settings."""
-    global colors  # Declare global at the beginning of the function
-    
     current_theme = get_theme()
     available_themes = get_available_themes()
+    count = len(available_themes)
     
-    print(f"\n{colors.HEADER}--- Theme Settings ---{colors.ENDC}")
-    print(f"Current theme: {colors.OKCYAN}{current_theme}{colors.ENDC}")
-    print("\nAvailable themes:")
+    lines = [
+        f"\n{colors.HEADER}--- Theme Settings ---{colors.ENDC}",
+        f"Current theme: {colors.OKCYAN}{current_theme}{colors.ENDC}",
+        "\nAvailable themes:",
+    ]
     
     # Show theme previews
-    for i, theme_name in enumerate(available_themes, 1):
-        preview = get_theme_preview(theme_name)
-        current_marker = " (current)" if theme_name == current_theme else ""
-        print(f"  {i}. {theme_name.title()}{current_marker}: {preview}")
+    lines.extend(
+        f"  {i}. {theme_name.title()}{' (current)' if theme_name == current_theme else ''}: "
+        f"{get_theme_preview(theme_name, _COLOR_OUTPUT)}"
+        for i, theme_name in enumerate(available_themes, 1)
+    )
     
-    print(f"  {len(available_themes) + 1}. Back")
-    print("-" * 50)
+    lines.append(f"  {count + 1}. Back")
+    lines.append(_HRULE)
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
     
-    try:
-        choice = input("Select a theme by number: ").strip()
-        if choice.isdigit():
-            choice_num = int(choice)
-            if 1 <= choice_num <= len(available_themes):
-                selected_theme = available_themes[choice_num - 1]
-                if selected_theme != current_theme:
-                    set_theme(selected_theme)
-                    print(f"{colors.OKGREEN}Theme changed to '{selected_theme}'. Changes will take effect immediately.{colors.ENDC}")
-                    # Force reload colors by creating a new instance
-                    colors = Colors()
-                else:
-                    print(f"{colors.WARNING}Theme '{selected_theme}' is already selected.{colors.ENDC}")
-            elif choice_num == len(available_themes) + 1:
-                return
-            else:
-                print(f"{colors.WARNING}Invalid selection.{colors.ENDC}")
+    choice = input("Select a theme by number: ").strip()
+    choice_num = parse_menu_number(choice)
+    if choice_num is None:
+        print(f"{colors.WARNING}Please enter a valid number.{colors.ENDC}")
+    elif 1 <= choice_num <= count:
+        selected_theme = available_themes[choice_num - 1]
+        if selected_theme != current_theme:
+            set_theme(selected_theme)
+            colors.invalidate()
+            print(f"{colors.OKGREEN}Theme changed to '{selected_theme}'. Changes will take effect immediately.{colors.ENDC}")
         else:
-            print(f"{colors.WARNING}Please enter a valid number.{colors.ENDC}")
-    except ValueError:
-        print(f"{colors.WARNING}Invalid input.{colors.ENDC}")
+            print(f"{colors.WARNING}Theme '{selected_theme}' is already selected.{colors.ENDC}")
+    elif choice_num == count + 1:
+        return
+    else:
+        print(f"{colors.WARNING}Invalid selection.{colors.ENDC}")
     
     input("Press Enter to continue...")
 
 
+_REPO_ACTION_VALUES = (
+    ("clone_update", "Clone or Update"),
+    ("details", "View Details"),
+    ("remove", "Remove from list"),
+    ("back", "Go Back"),
+)
+
+
 def get_repo_action_interactively():
     """Asks the user what to do with a selected repository."""
+    from prompt_toolkit.shortcuts import radiolist_dialog
+
     action = radiolist_dialog(
         title="Repository Action",
         text="What do you want to do with this repository?",
-        values=[
-            ("clone_update", "Clone or Update"),
-            ("details", "View Details"),
-            ("remove", "Remove from list"),
-            ("back", "Go Back"),
-        ],
+        values=_REPO_ACTION_VALUES,
     ).run()
     return action
 
@@ -356,14 +509,93 @@ def display_repo_details(repo):
 
 def ask_to_stash_changes():
     """Asks the user if they want to stash local changes."""
+    from prompt_toolkit.shortcuts import confirm
+
+    # confirm() already runs the prompt and returns a bool
     return confirm(
         "Local changes would be overwritten by pull. Do you want to stash them, pull, and then reapply?"
-    ).run()
+    )
 
 
-def search_frequent_repos():
-    """Search through frequent repositories."""
-    repos = load_frequent_repos()
+# Search strings for the repo list last searched, reused while it's the same
+# list with the same length (browse_frequent_repos() passes the list it
+# loaded to every search of its session)
+_search_cache = {"repos": None, "size": 0, "choices": None}
+
+
+def _get_fuzzy_backend():
+    """
+    Returns (process, fuzz, default_process) from RapidFuzz, which does the
+    matching in C++, or from fuzzywuzzy, which has the same API in Python
+    (default_process is then None). Returns False if neither is installed.
+    """
+    global _fuzzy_backend
+    if _fuzzy_backend is None:
+        try:
+            from rapidfuzz import fuzz, process
+            from rapidfuzz.utils import default_process
+            _fuzzy_backend = (process, fuzz, default_process)
+        except ImportError:
+            try:
+                from fuzzywuzzy import fuzz, process
+                _fuzzy_backend = (process, fuzz, None)
+            except ImportError:
+                _fuzzy_backend = False
+    return _fuzzy_backend
+
+
+def _search_choices(repos, normalize=None):
+    """
+    Returns {position: "name url"} for repos. With a normalize function
+    (RapidFuzz's default_process) the strings are normalized here once,
+    instead of on every comparison.
+    """
+    if _search_cache["repos"] is repos and _search_cache["size"] == len(repos):
+        return _search_cache["choices"]
+    choices = {
+        i: f"{repo.get('name', '')} {repo.get('url', '')}"
+        for i, repo in enumerate(repos)
+    }
+    if normalize is not None:
+        choices = {i: normalize(text) for i, text in choices.items()}
+    _search_cache.update(repos=repos, size=len(repos), choices=choices)
+    return choices
+
+
+def _fuzzy_matches(query, repos, backend):
+    """
+    Returns (choice, score, position) for the FUZZY_RESULTS_LIMIT best repos
+    scoring at least FUZZY_SCORE_CUTOFF against query, best first.
+    """
+    process, fuzz, default_process = backend
+    choices = _search_choices(repos, default_process)
+    if default_process is not None:
+        # choices are already normalized; the cutoff runs inside RapidFuzz
+        return process.extract(
+            default_process(query), choices, scorer=fuzz.WRatio, processor=None,
+            score_cutoff=FUZZY_SCORE_CUTOFF, limit=FUZZY_RESULTS_LIMIT,
+        )
+    return process.extractBests(
+        query, choices, scorer=fuzz.WRatio,
+        score_cutoff=FUZZY_SCORE_CUTOFF, limit=FUZZY_RESULTS_LIMIT,
+    )
+
+
+def _repo_menu_lines(repos):
+    """Yields the numbered menu line for each repo, starting at 1."""
+    cyan, endc = colors.OKCYAN, colors.ENDC
+    for i, repo in enumerate(repos, 1):
+        yield f"  {i}. {cyan}{repo.get('name')}{endc} ({repo.get('url')}) -> {repo.get('path', 'Not cloned')}"
+
+
+def search_frequent_repos(repos=None):
+    """
+    Search through frequent repositories (repos, or the saved list if not given).
+    Returns a (repo, index) tuple, where index is the repo's position in the
+    frequent list, or None if nothing was selected.
+    """
+    if repos is None:
+        repos = load_frequent_repos()
     
     if not repos:
         print(f"{colors.WARNING}No frequent repositories found to search.{colors.ENDC}")
@@ -372,8 +604,9 @@ def search_frequent_repos():
     
     print(f"\n{colors.HEADER}--- Search Repositories ---{colors.ENDC}")
     
-    if not FUZZY_SEARCH_AVAILABLE:
-        print(f"{colors.WARNING}Note: Advanced fuzzy search is not available. Install 'fuzzywuzzy' for better search results.{colors.ENDC}")
+    fuzzy_backend = _get_fuzzy_backend()
+    if not fuzzy_backend:
+        print(f"{colors.WARNING}Note: Advanced fuzzy search is not available. Install 'rapidfuzz' for better search results.{colors.ENDC}")
     
     search_query = input("Enter search term (name or URL): ").strip()
     
@@ -382,40 +615,27 @@ def search_frequent_repos():
         input("Press Enter to continue...")
         return None
     
-    # Perform search
-    matching_repos = []
+    # Plain substring matches first: they're what most searches are after
+    search_lower = search_query.lower()
+    matching_repos = [
+        (repo, index)
+        for index, repo in enumerate(repos)
+        if search_lower in repo.get('name', '').lower()
+        or search_lower in repo.get('url', '').lower()
+    ]
     
-    if FUZZY_SEARCH_AVAILABLE:
-        # Use fuzzy matching for better results
-        repo_strings = []
-        for i, repo in enumerate(repos):
-            search_string = f"{repo.get('name', '')} {repo.get('url', '')}"
-            repo_strings.append((search_string, i))
-        
-        # Extract just the strings for fuzzy matching
-        strings_only = [item[0] for item in repo_strings]
-        
-        # Get fuzzy matches (threshold of 60 for reasonable results)
-        fuzzy_results = process.extract(search_query, strings_only, limit=len(strings_only))
-        
-        for match_string, score in fuzzy_results:
-            if score >= 60:  # Minimum similarity threshold
-                # Find the original repo index
-                repo_index = next(i for string, i in repo_strings if string == match_string)
-                matching_repos.append((repos[repo_index], score))
-        
-        # Sort by score (best matches first)
-        matching_repos.sort(key=lambda x: x[1], reverse=True)
-        matching_repos = [repo for repo, score in matching_repos]  # Remove scores for display
-        
-    else:
-        # Simple string matching fallback
-        search_lower = search_query.lower()
-        for repo in repos:
-            name = repo.get('name', '').lower()
-            url = repo.get('url', '').lower()
-            if search_lower in name or search_lower in url:
-                matching_repos.append(repo)
+    # Fuzzy matching only when the substring hits are few and the query is
+    # long enough for typos to be worth correcting
+    if (
+        fuzzy_backend
+        and len(matching_repos) < SUBSTRING_MATCHES_ENOUGH
+        and len(search_query) > SHORT_QUERY_LENGTH
+    ):
+        # Matches come back best first, keyed by the repo's position in the list
+        matching_repos = [
+            (repos[index], index)
+            for _, _, index in _fuzzy_matches(search_query, repos, fuzzy_backend)
+        ]
     
     if not matching_repos:
         print(f"{colors.WARNING}No repositories found matching '{search_query}'.{colors.ENDC}")
@@ -423,69 +643,71 @@ def search_frequent_repos():
         return None
     
     # Display results
-    print(f"\n{colors.OKGREEN}Found {len(matching_repos)} matching repositories:{colors.ENDC}")
-    for i, repo in enumerate(matching_repos, 1):
-        path_info = f" -> {repo.get('path', 'Not cloned')}"
-        print(f"  {i}. {colors.OKCYAN}{repo.get('name')}{colors.ENDC} ({repo.get('url')}){path_info}")
-    
-    print(f"  {len(matching_repos) + 1}. Back to search")
-    print("-" * 50)
-    
-    try:
-        choice = input("Select a repository by number: ").strip()
-        if choice.isdigit():
-            choice_num = int(choice)
-            if 1 <= choice_num <= len(matching_repos):
-                return matching_repos[choice_num - 1]
-            elif choice_num == len(matching_repos) + 1:
-                return None
-            else:
-                print(f"{colors.WARNING}Invalid selection.{colors.ENDC}")
-                input("Press Enter to continue...")
-                return None
+    lines = [f"\n{colors.OKGREEN}Found {len(matching_repos)} matching repositories:{colors.ENDC}"]
+    lines.extend(_repo_menu_lines(repo for repo, _ in matching_repos))
+    lines.append(f"  {len(matching_repos) + 1}. Back to search")
+    lines.append(_HRULE)
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+    
+    choice = input("Select a repository by number: ").strip()
+    choice_num = parse_menu_number(choice)
+    if choice_num is not None:
+        if 1 <= choice_num <= len(matching_repos):
+            return matching_repos[choice_num - 1]
+        elif choice_num == len(matching_repos) + 1:
+            return None
         else:
-            print(f"{colors.WARNING}Please enter a valid number.{colors.ENDC}")
+            print(f"{colors.WARNING}Invalid selection.{colors.ENDC}")
             input("Press Enter to continue...")
             return None
-    except ValueError:
-        print(f"{colors.WARNING}Invalid input.{colors.ENDC}")
+    else:
+        print(f"{colors.WARNING}Please enter a valid number.{colors.ENDC}")
         input("Press Enter to continue...")
         return None
 
+
 def browse_frequent_repos():
-    """Browse and select from frequent repositories with search option."""
+    """
+    Browse and select from frequent repositories with search option.
+    Returns a (repo, index) tuple, or None if the user went back.
+    """
+    # Nothing below changes the list, so it is loaded once for the session
+    repos = load_frequent_repos()
+    
+    if not repos:
+        print(f"{colors.WARNING}No frequent repositories found.{colors.ENDC}")
+        input("Press Enter to continue...")
+        return None
+    
+    lines = [f"\n{colors.HEADER}--- Frequent Repositories ---{colors.ENDC}"]
+    
+    # Show all repositories
+    lines.extend(_repo_menu_lines(repos))
+    
+    search_num, back_num = len(repos) + 1, len(repos) + 2
+    lines.append(f"\n  {search_num}. Search repositories")
+    lines.append(f"  {back_num}. Back to main menu")
+    lines.append(_HRULE)
+    menu = "\n".join(lines) + "\n"
+    
     while True:
-        repos = load_frequent_repos()
-        
-        if not repos:
-            print(f"{colors.WARNING}No frequent repositories found.{colors.ENDC}")
-            input("Press Enter to continue...")
-            return None
-        
-        print(f"\n{colors.HEADER}--- Frequent Repositories ---{colors.ENDC}")
-        
-        # Show all repositories
-        for i, repo in enumerate(repos, 1):
-            path_info = f" -> {repo.get('path', 'Not cloned')}"
-            print(f"  {i}. {colors.OKCYAN}{repo.get('name')}{colors.ENDC} ({repo.get('url')}){path_info}")
-        
-        print(f"\n  {len(repos) + 1}. Search repositories")
-        print(f"  {len(repos) + 2}. Back to main menu")
-        print("-" * 50)
+        sys.stdout.write(menu)
+        sys.stdout.flush()
         
         choice = input("Select an option: ").strip()
         
-        if choice.isdigit():
-            choice_num = int(choice)
+        choice_num = parse_menu_number(choice)
+        if choice_num is not None:
             if 1 <= choice_num <= len(repos):
-                return repos[choice_num - 1]
-            elif choice_num == len(repos) + 1:
+                return repos[choice_num - 1], choice_num - 1
+            elif choice_num == search_num:
                 # Search functionality
-                selected_repo = search_frequent_repos()
+                selected_repo = search_frequent_repos(repos)
                 if selected_repo:
                     return selected_repo
                 # If no repo selected from search, continue the loop
-            elif choice_num == len(repos) + 2:
+            elif choice_num == back_num:
                 return None
             else:
                 print(f"{colors.WARNING}Invalid selection.{colors.ENDC}")
@@ -495,37 +717,45 @@ def browse_frequent_repos():
             input("Press Enter to continue...")
 
 
+_API_MENU_OPTIONS = (
+    "1. Configure GitHub token\n"
+    "2. Configure GitLab token\n"
+    "3. Set custom GitLab URL\n"
+    "4. Test connections\n"
+    "5. Browse online repositories\n"
+    "6. Remove API tokens\n"
+    "7. Back to settings"
+)
+
+
 def manage_api_integrations():
     """Manage API integrations with GitHub and GitLab."""
     from modules.config_manager import get_api_tokens, set_api_token, remove_api_token, get_gitlab_url, set_gitlab_url
     
+    ui_console = _get_console()
     while True:
         tokens = get_api_tokens()
         
-        if RICH_UI_AVAILABLE:
+        if ui_console:
             ui_console.print(f"\n[bold blue]--- API Integrations ---[/bold blue]")
         else:
             print(f"\n{colors.HEADER}--- API Integrations ---{colors.ENDC}")
         
-        print("1. Configure GitHub token")
-        print("2. Configure GitLab token")
-        print("3. Set custom GitLab URL")
-        print("4. Test connections")
-        print("5. Browse online repositories")
-        print("6. Remove API tokens")
-        print("7. Back to settings")
+        lines = [_API_MENU_OPTIONS]
         
         # Show current status
         if tokens:
-            print(f"\n{colors.OKCYAN}Current integrations:{colors.ENDC}")
+            lines.append(f"\n{colors.OKCYAN}Current integrations:{colors.ENDC}")
             if "github" in tokens:
-                print(f"  ✅ GitHub: Connected")
+                lines.append("  ✅ GitHub: Connected")
             if "gitlab" in tokens:
-                print(f"  ✅ GitLab: Connected")
+                lines.append("  ✅ GitLab: Connected")
         else:
-            print(f"\n{colors.WARNING}No API tokens configured{colors.ENDC}")
+            lines.append(f"\n{colors.WARNING}No API tokens configured{colors.ENDC}")
         
-        print("-" * 50)
+        lines.append(_HRULE)
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
         
         choice = input("Select an option: ").strip()
         
@@ -548,8 +778,20 @@ def manage_api_integrations():
             input("Press Enter to continue...")
 
 
+# Settings menu choice -> handler (here because it names manage_api_integrations)
+_SETTINGS_ACTIONS = {
+    "1": _change_default_clone_dir,
+    "2": manage_theme_settings,
+    "3": manage_api_integrations,
+    "4": functools.partial(_toggle_setting, "SSH connection sharing", get_ssh_multiplexing, set_ssh_multiplexing),
+    "5": functools.partial(_toggle_setting, "Local object cache", get_object_cache, set_object_cache),
+    "6": functools.partial(_toggle_setting, "Shallow clones when not asked", get_shallow_clone, set_shallow_clone),
+}
+
+
 def configure_github_token():
     """Configure GitHub personal access token."""
+    ui_console = _get_console()
     print(f"\n{colors.HEADER}--- GitHub Token Configuration ---{colors.ENDC}")
     print("To create a GitHub Personal Access Token:")
     print("1. Go to GitHub.com → Settings → Developer settings → Personal access tokens")
@@ -575,14 +817,14 @@ def configure_github_token():
             from modules.config_manager import set_api_token
             set_api_token("github", token)
             
-            if RICH_UI_AVAILABLE:
+            if ui_console:
                 ui_console.print(f"✅ [green]GitHub token configured successfully![/green]")
                 ui_console.print(f"Connected as: [cyan]{user_info.get('username', 'Unknown')}[/cyan]")
             else:
                 print(f"{colors.OKGREEN}✅ GitHub token configured successfully!{colors.ENDC}")
                 print(f"Connected as: {user_info.get('username', 'Unknown')}")
         else:
-            if RICH_UI_AVAILABLE:
+            if ui_console:
                 ui_console.print(f"❌ [red]Token validation failed: {message}[/red]")
             else:
                 print(f"{colors.FAIL}❌ Token validation failed: {message}{colors.ENDC}")
@@ -597,6 +839,7 @@ def configure_github_token():
 
 def configure_gitlab_token():
     """Configure GitLab personal access token."""
+    ui_console = _get_console()
     print(f"\n{colors.HEADER}--- GitLab Token Configuration ---{colors.ENDC}")
     print("To create a GitLab Personal Access Token:")
     print("1. Go to GitLab.com → User Settings → Access Tokens")
@@ -623,14 +866,14 @@ def configure_gitlab_token():
             from modules.config_manager import set_api_token
             set_api_token("gitlab", token)
             
-            if RICH_UI_AVAILABLE:
+            if ui_console:
                 ui_console.print(f"✅ [green]GitLab token configured successfully![/green]")
                 ui_console.print(f"Connected as: [cyan]{user_info.get('username', 'Unknown')}[/cyan]")
             else:
                 print(f"{colors.OKGREEN}✅ GitLab token configured successfully!{colors.ENDC}")
                 print(f"Connected as: {user_info.get('username', 'Unknown')}")
         else:
-            if RICH_UI_AVAILABLE:
+            if ui_console:
                 ui_console.print(f"❌ [red]Token validation failed: {message}[/red]")
             else:
                 print(f"{colors.FAIL}❌ Token validation failed: {message}{colors.ENDC}")
@@ -645,6 +888,7 @@ def configure_gitlab_token():
 
 def configure_gitlab_url():
     """Configure custom GitLab URL."""
+    from urllib.parse import urlsplit
     from modules.config_manager import get_gitlab_url, set_gitlab_url
     
     current_url = get_gitlab_url()
@@ -659,8 +903,18 @@ def configure_gitlab_url():
         if not new_url.startswith(('http://', 'https://')):
             new_url = 'https://' + new_url
         
-        set_gitlab_url(new_url)
-        print(f"{colors.OKGREEN}GitLab URL updated to: {new_url}{colors.ENDC}")
+        # Refuse anything without a usable host before it reaches the config
+        try:
+            parts = urlsplit(new_url)
+            parts.port  # Raises ValueError for a malformed port
+        except ValueError:
+            parts = None
+        if parts is None or not parts.hostname or " " in parts.netloc:
+            print(f"{colors.WARNING}'{new_url}' is not a valid URL. The GitLab URL was not changed.{colors.ENDC}")
+        else:
+            new_url = new_url.rstrip("/")
+            set_gitlab_url(new_url)
+            print(f"{colors.OKGREEN}GitLab URL updated to: {new_url}{colors.ENDC}")
     
     input("Press Enter to continue...")
 
@@ -679,16 +933,13 @@ def test_api_connections():
     print(f"\n{colors.HEADER}--- Testing API Connections ---{colors.ENDC}")
     
     try:
-        from modules.api_clients import test_token
+        from modules.api_clients import test_tokens
         
-        for service, token in tokens.items():
+        # All services are tested at once; results are shown in config order
+        results = test_tokens(tokens, get_gitlab_url())
+        for service, result in results.items():
             print(f"\nTesting {service.title()}...")
-            
-            if service == "gitlab":
-                gitlab_url = get_gitlab_url()
-                success, message, user_info = test_token(service, token, gitlab_url)
-            else:
-                success, message, user_info = test_token(service, token)
+            success, message, user_info = result.result()
             
             if success:
                 username = user_info.get('username', 'Unknown')
@@ -713,19 +964,21 @@ def remove_api_tokens_menu():
         input("Press Enter to continue...")
         return
     
-    print(f"\n{colors.HEADER}--- Remove API Tokens ---{colors.ENDC}")
     services = list(tokens.keys())
     
-    for i, service in enumerate(services, 1):
-        print(f"  {i}. Remove {service.title()} token")
-    
-    print(f"  {len(services) + 1}. Cancel")
-    print("-" * 30)
+    lines = [f"\n{colors.HEADER}--- Remove API Tokens ---{colors.ENDC}"]
+    lines.extend(
+        f"  {i}. Remove {service.title()} token" for i, service in enumerate(services, 1)
+    )
+    lines.append(f"  {len(services) + 1}. Cancel")
+    lines.append("-" * 30)
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
     
     choice = input("Select a token to remove: ").strip()
     
-    if choice.isdigit():
-        choice_num = int(choice)
+    choice_num = parse_menu_number(choice)
+    if choice_num is not None:
         if 1 <= choice_num <= len(services):
             service = services[choice_num - 1]
             if remove_api_token(service):
@@ -765,8 +1018,8 @@ def browse_online_repositories():
     
     choice = input("Select a service: ").strip()
     
-    if choice.isdigit():
-        choice_num = int(choice)
+    choice_num = parse_menu_number(choice)
+    if choice_num is not None:
         if 1 <= choice_num <= len(services):
             service = services[choice_num - 1]
             token = tokens[service]
@@ -774,11 +1027,7 @@ def browse_online_repositories():
             try:
                 from modules.api_clients import create_client
                 
-                if service == "gitlab":
-                    client = create_client(service, token, get_gitlab_url())
-                else:
-                    client = create_client(service, token)
-                
+                client = create_client(service, token, get_gitlab_url())
                 return browse_service_repositories(client, service)
                 
             except ImportError:
@@ -802,56 +1051,128 @@ def browse_online_repositories():
         return None
 
 
-def browse_service_repositories(client, service_name):
-    """Browse repositories from a specific service."""
+# Online repositories listed per page
+REPOS_PAGE_SIZE = 20
+
+
+def _format_age(seconds):
+    """Rough human-readable age, e.g. '5 min' or '3 h'."""
+    if seconds < 60:
+        return f"{int(seconds)} s"
+    if seconds < 3600:
+        return f"{int(seconds // 60)} min"
+    if seconds < 86400:
+        return f"{int(seconds // 3600)} h"
+    return f"{int(seconds // 86400)} d"
+
+
+def _online_repo_lines(repos):
+    """Yields the numbered menu line(s) for each online repo, starting at 1."""
+    cyan, endc = colors.OKCYAN, colors.ENDC
+    for i, repo in enumerate(repos, 1):
+        visibility = "🔒" if repo.private else "🌐"
+        language = f" [{repo.language}]" if repo.language else ""
+        stars = f" ⭐{repo.stars}" if repo.stars else ""
+        yield f"  {i}. {visibility} {cyan}{repo.name}{endc}{language}{stars}"
+        desc = repo.description
+        if desc:
+            yield f"      {desc[:60]}..." if len(desc) > 60 else f"      {desc}"
+
+
+def browse_service_repositories(client, service_name, repos_future=None):
+    """
+    Browse repositories from a specific service.
+    repos_future, if given, is a prefetch_repositories() future for client.
+    While it is still loading, or if it fails, the last cached list is shown
+    instead.
+    """
     try:
-        print(f"\nFetching {service_name} repositories...")
-        repos = client.get_repositories(per_page=20)
+        from modules.api_clients import cached_repositories, prefetch_repositories
         
-        if not repos:
+        if repos_future is None:
+            repos_future = prefetch_repositories({service_name: client})[service_name]
+        
+        cached = None if repos_future.done() else cached_repositories(client)
+        if cached is not None:
+            # Stale-while-revalidate: show the stored list, swap in the fresh one later
+            all_repos = cached[1]
+            print(f"\nShowing {service_name} repositories cached {_format_age(time.time() - cached[0])} ago; refreshing in the background...")
+        else:
+            print(f"\nFetching {service_name} repositories...")
+            try:
+                all_repos = repos_future.result()
+            except Exception as e:
+                cached = cached_repositories(client)
+                if cached is None:
+                    raise
+                print(f"{colors.WARNING}Could not fetch the list ({e}); showing the one cached {_format_age(time.time() - cached[0])} ago.{colors.ENDC}")
+                all_repos = cached[1]
+                cached = None  # Nothing newer is coming
+        stale = cached is not None
+        # Everything is fetched up front; show it one page at a time so a
+        # redraw costs REPOS_PAGE_SIZE lines however long the list is
+        page = 0
+        
+        if not all_repos:
             print(f"{colors.WARNING}No repositories found.{colors.ENDC}")
             input("Press Enter to continue...")
             return None
         
         while True:
-            print(f"\n{colors.HEADER}--- {service_name.title()} Repositories ---{colors.ENDC}")
+            if stale and repos_future.done():
+                stale = False
+                try:
+                    all_repos = repos_future.result()
+                except Exception:
+                    pass  # Offline or failing: keep browsing the cached list
             
-            for i, repo in enumerate(repos, 1):
-                visibility = "🔒" if repo.get("private") else "🌐"
-                language = f" [{repo.get('language', 'N/A')}]" if repo.get('language') else ""
-                stars = f" ⭐{repo.get('stars', 0)}" if repo.get('stars') else ""
-                
-                print(f"  {i}. {visibility} {colors.OKCYAN}{repo['name']}{colors.ENDC}{language}{stars}")
-                if repo.get('description'):
-                    desc = repo['description'][:60] + "..." if len(repo['description']) > 60 else repo['description']
-                    print(f"      {desc}")
+            page_count = max(1, -(-len(all_repos) // REPOS_PAGE_SIZE))
+            page = min(page, page_count - 1)
+            repos = all_repos[page * REPOS_PAGE_SIZE:(page + 1) * REPOS_PAGE_SIZE]
             
-            print(f"\n  {len(repos) + 1}. Load more repositories")
-            print(f"  {len(repos) + 2}. Back")
-            print("-" * 50)
+            lines = [f"\n{colors.HEADER}--- {service_name.title()} Repositories (page {page + 1}/{page_count}) ---{colors.ENDC}"]
+            lines.extend(_online_repo_lines(repos))
+            back_num = len(repos) + 1
+            # Navigation keys offered on this page -> page they lead to
+            page_keys = {}
+            if page + 1 < page_count:
+                page_keys["N"] = page + 1
+            if page > 0:
+                page_keys["P"] = page - 1
             
-            choice = input("Select a repository: ").strip()
+            lines.append(f"\n  {back_num}. Back")
+            if "N" in page_keys:
+                lines.append("  N. Next page")
+            if "P" in page_keys:
+                lines.append("  P. Previous page")
+            lines.append("  R. Refresh list")
+            lines.append(_HRULE)
+            sys.stdout.write("\n".join(lines) + "\n")
+            sys.stdout.flush()
             
-            if choice.isdigit():
-                choice_num = int(choice)
+            choice = input("Select a repository: ").strip().upper()
+            
+            if choice in page_keys:
+                page = page_keys[choice]
+                continue
+            if choice == "R":
+                print(f"\nFetching {service_name} repositories...")
+                try:
+                    all_repos = prefetch_repositories({service_name: client}, max_age=0)[service_name].result()
+                except Exception as e:
+                    print(f"{colors.WARNING}Refresh failed ({e}); keeping the current list.{colors.ENDC}")
+                    input("Press Enter to continue...")
+                stale = False
+                continue
+            
+            choice_num = parse_menu_number(choice)
+            if choice_num is not None:
                 if 1 <= choice_num <= len(repos):
                     selected_repo = repos[choice_num - 1]
                     result = handle_online_repository_selection(selected_repo, service_name)
                     if result:  # If user chose to clone
                         return result
-                elif choice_num == len(repos) + 1:
-                    # Load more repositories
-                    try:
-                        more_repos = client.get_repositories(per_page=20)
-                        if more_repos:
-                            repos.extend(more_repos)
-                        else:
-                            print(f"{colors.WARNING}No more repositories found.{colors.ENDC}")
-                            input("Press Enter to continue...")
-                    except Exception as e:
-                        print(f"{colors.FAIL}Error loading more repositories: {str(e)}{colors.ENDC}")
-                        input("Press Enter to continue...")
-                elif choice_num == len(repos) + 2:
+                elif choice_num == back_num:
                     return None
                 else:
                     print(f"{colors.WARNING}Invalid selection.{colors.ENDC}")
@@ -866,60 +1187,90 @@ def browse_service_repositories(client, service_name):
         return None
 
 
+_ONLINE_REPO_ACTIONS = (
+    "1. Clone repository (HTTPS)\n"
+    "2. Clone repository (SSH)\n"
+    "3. Add to frequent repositories\n"
+    "4. View more details\n"
+    "5. Back\n"
+    + "-" * 30
+)
+
+
+def _add_online_repo_to_frequent(repo):
+    """Adds repo to the frequent list under a name the user picks."""
+    from modules.config_manager import add_frequent_repo, find_frequent_repo
+    
+    known = find_frequent_repo(repo.clone_url_https) or find_frequent_repo(repo.clone_url_ssh)
+    if known is not None:
+        # Re-adding would reset its saved clone path
+        print(f"{colors.WARNING}Already in frequent repositories as '{known.get('name')}'.{colors.ENDC}")
+        input("Press Enter to continue...")
+        return None
+    
+    friendly_name = input(f"Enter a friendly name for '{repo.name}': ").strip()
+    if not friendly_name:
+        friendly_name = repo.name
+    
+    clone_url = repo.clone_url_https  # Default to HTTPS
+    
+    add_frequent_repo({
+        "name": friendly_name,
+        "url": clone_url,
+        "path": None
+    })
+    
+    print(f"{colors.OKGREEN}Repository added to frequent list!{colors.ENDC}")
+    input("Press Enter to continue...")
+    return None
+
+
+def _show_online_repo_details(repo):
+    """Prints the fields not shown in the repository header."""
+    lines = [
+        f"\n{colors.HEADER}--- Detailed Information ---{colors.ENDC}",
+        f"Full name: {repo.full_name or 'N/A'}",
+        f"HTTPS Clone URL: {repo.clone_url_https}",
+        f"SSH Clone URL: {repo.clone_url_ssh}",
+        f"Default branch: {repo.default_branch or 'main'}",
+        f"Last updated: {repo.updated_at or 'N/A'}",
+    ]
+    if repo.forks:
+        lines.append(f"Forks: {repo.forks}")
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+    
+    input("Press Enter to continue...")
+    return None
+
+
+# Online repository action -> handler; each returns a URL to clone, or None
+_ONLINE_REPO_HANDLERS = {
+    "1": lambda repo: repo.clone_url_https,
+    "2": lambda repo: repo.clone_url_ssh,
+    "3": _add_online_repo_to_frequent,
+    "4": _show_online_repo_details,
+}
+
+
 def handle_online_repository_selection(repo, service_name):
     """Handle actions for a selected online repository."""
-    print(f"\n{colors.HEADER}--- Repository: {repo['name']} ---{colors.ENDC}")
-    print(f"Description: {repo.get('description', 'No description')}")
-    print(f"Language: {repo.get('language', 'N/A')}")
-    print(f"Stars: {repo.get('stars', 0)}")
-    print(f"Private: {'Yes' if repo.get('private') else 'No'}")
-    print()
-    print("1. Clone repository (HTTPS)")
-    print("2. Clone repository (SSH)")
-    print("3. Add to frequent repositories")
-    print("4. View more details")
-    print("5. Back")
-    print("-" * 30)
+    sys.stdout.write(
+        f"\n{colors.HEADER}--- Repository: {repo.name} ---{colors.ENDC}\n"
+        f"Description: {repo.description or 'No description'}\n"
+        f"Language: {repo.language or 'N/A'}\n"
+        f"Stars: {repo.stars or 0}\n"
+        f"Private: {'Yes' if repo.private else 'No'}\n"
+        f"\n{_ONLINE_REPO_ACTIONS}\n"
+    )
+    sys.stdout.flush()
     
     choice = input("Select an action: ").strip()
     
-    if choice == "1":
-        return repo['clone_url_https']
-    elif choice == "2":
-        return repo['clone_url_ssh']
-    elif choice == "3":
-        # Add to frequent repositories
-        from modules.config_manager import add_frequent_repo
-        
-        friendly_name = input(f"Enter a friendly name for '{repo['name']}': ").strip()
-        if not friendly_name:
-            friendly_name = repo['name']
-        
-        clone_url = repo['clone_url_https']  # Default to HTTPS
-        
-        add_frequent_repo({
-            "name": friendly_name,
-            "url": clone_url,
-            "path": None
-        })
-        
-        print(f"{colors.OKGREEN}Repository added to frequent list!{colors.ENDC}")
-        input("Press Enter to continue...")
-    elif choice == "4":
-        # Show more details
-        print(f"\n{colors.HEADER}--- Detailed Information ---{colors.ENDC}")
-        print(f"Full name: {repo.get('full_name', 'N/A')}")
-        print(f"HTTPS Clone URL: {repo['clone_url_https']}")
-        print(f"SSH Clone URL: {repo['clone_url_ssh']}")
-        print(f"Default branch: {repo.get('default_branch', 'main')}")
-        print(f"Last updated: {repo.get('updated_at', 'N/A')}")
-        if repo.get('forks'):
-            print(f"Forks: {repo['forks']}")
-        
-        input("Press Enter to continue...")
-    elif choice == "5":
-        return None
-    else:
+    handler = _ONLINE_REPO_HANDLERS.get(choice)
+    if handler:
+        return handler(repo)
+    elif choice != "5":
         print(f"{colors.WARNING}Invalid option.{colors.ENDC}")
         input("Press Enter to continue...")
     